@@ -1 +1 @@
-__all__ = ["resultsproducer", "statisticsproducer"]
+__all__ = ["resultsproducer", "statisticsproducer", "telemetry", "differential"]
@@ -0,0 +1,96 @@
+import numpy
+
+from benchmark.resultsproducer import simulate
+from network.graphtype import GraphType
+from nodes.protocoltype import ProtocolType
+from sim.monitor import MassMonitor
+from sim.reference import ReferenceSimulator
+
+
+def final_aggregates(simulator):
+    """ Aggregate every node of a simulation ended with.
+
+    Arguments:
+        simulator {FaultySimulator} -- simulator after running
+
+    Returns:
+        [dictionary] -- aggregate of each node
+    """
+
+    return {name: node.aggregate for name, node in simulator.nodes.items()}
+
+
+def compare_engines(graph_type, vertices, initial_value, fanout, no_news, error_percentage, seeds=range(5),
+                    fast=None, reference=None, tolerance=1e-3, monitor=True, values="random", **options):
+    """ Run seeded configurations on a fast path and on the reference engine, and compare the aggregates every
+    node ends with. Both see the same topology, initial values and random streams, but handle events in a different
+    order, so only their results are expected to agree, within tolerance. Nodes start with different values by
+    default, so a fast path that mixes up the values of the nodes does not end with the same aggregates.
+
+    Arguments:
+        graph_type {GraphType} -- Type of the graph to be generated
+        vertices {int} -- number of vertices of the graph
+        initial_value {int} -- average initial value of the nodes
+        fanout {int} -- fanout value for multicast
+        no_news {int} -- size of the no_news array
+        error_percentage {float} -- probability for errors to occur
+
+    Keyword Arguments:
+        seeds {array} -- seeds to run (default: {range(5)})
+        fast {dictionary} -- keyword arguments of simulate for the fast path, e.g. {"memory_budget": 10 ** 9}
+                             (default: {the FaultySimulator as is})
+        reference {dictionary} -- keyword arguments of simulate for the reference
+                                  (default: {{"simulator": ReferenceSimulator}})
+        tolerance {float} -- relative difference allowed between aggregates (default: {1e-3})
+        monitor {bool} -- check that both conserve sum and weight while running (default: {True})
+        values {string} -- initial values of the nodes, see simulate (default: {"random"})
+        options {any} -- further keyword arguments of simulate for both, e.g. protocol or initiators
+
+    Returns:
+        [array] -- (seed, description) of every difference found, empty when the fast path agrees
+    """
+
+    fast = fast if fast is not None else {}
+    reference = reference if reference is not None else {"simulator": ReferenceSimulator}
+
+    differences = []
+
+    for seed in seeds:
+
+        results = []
+
+        for engine in (fast, reference):
+            arguments = dict(options, **engine)
+            if monitor:
+                arguments["monitor"] = MassMonitor()
+
+            try:
+                results.append(simulate(graph_type, vertices, initial_value, fanout, no_news, error_percentage,
+                                        seed=seed, values=values, **arguments))
+            except AssertionError as error:
+                differences.append((seed, str(error)))
+                results.append(None)
+
+        if None in results:
+            continue
+
+        fast_sim, reference_sim = results
+
+        if fast_sim.status is not reference_sim.status:
+            differences.append((seed, "stopped with {} instead of {}".format(fast_sim.status, reference_sim.status)))
+
+        expected = final_aggregates(reference_sim)
+
+        for name, aggregate in final_aggregates(fast_sim).items():
+            if name not in expected:
+                differences.append((seed, "{} is not in the reference".format(name)))
+
+            elif not numpy.allclose(aggregate, expected[name], rtol=tolerance, atol=0):
+                differences.append((seed, "{} ended with {} instead of {}".format(name, aggregate, expected[name])))
+
+    return differences
+
+
+if __name__ == '__main__':
+    for __protocol in ProtocolType:
+        print(__protocol.name, compare_engines(GraphType.WATTS_STROGATZ, 32, 10, 2, 5, 0.05, protocol=__protocol))
@@ -1,53 +1,323 @@
+import collections
 import concurrent.futures
+import contextlib
+import logging
+import time
+
+import numpy
 
 from network.graphtype import GraphType
+from nodes.flowupdating import FlowUpdatingNode
+from nodes.protocoltype import ProtocolType
+from nodes.pushpull import PushPullNode
 from nodes.pushsum import PushSumNode, MessageType, GossipType
-from network.graphAlgorithm import erdosRenyi, barabasiAlbert, wattsStrogatz
+from nodes.spanningtree import SpanningTreeNode
+from benchmark.telemetry import SweepTelemetry
+from network.graphAlgorithm import erdosRenyi, barabasiAlbert, wattsStrogatzEdges, vertex_names
+from network.sharedtopology import SharedTopology, index
 from sim.faulty import FaultySimulator
+from sim.runstatus import RunStatus
+from sim.streams import RandomStreams
 
 
-def create_topology(graph_type, vertices, initial_value, fanout, no_news):
-    """ Create a graph topology depending on the type
+logger = logging.getLogger(__name__)
+
+# shared topologies this process is attached to, by descriptor
+_attached = {}
+
+# node implementation of each protocol
+PROTOCOLS = {
+    ProtocolType.PUSH_SUM: PushSumNode,
+    ProtocolType.PUSH_PULL: PushPullNode,
+    ProtocolType.FLOW_UPDATING: FlowUpdatingNode,
+    ProtocolType.SPANNING_TREE: SpanningTreeNode,
+}
+
+
+def generate_edges(graph_type, vertices, rng=None):
+    """ Generate the edges of a graph depending on the type
 
     Arguments:
         graph_type {GraphType} -- Type of the graph to be generated
         vertices {int} -- number of vertices of the graph
-        initial_value {int} -- initial value of each node
-        fanout {int} -- fanout value for multicast
-        no_news {int} -- size of the no_news array
+
+    Keyword Arguments:
+        rng {Generator} -- numpy generator to draw from, seeded from the OS entropy when not given (default: {None})
 
     Returns:
-        [nodes] -- generated nodes
-        [distances] -- generated distances
+        [ndarray] -- first endpoint index of each edge
+        [ndarray] -- second endpoint index of each edge
     """
 
     graph = None
 
     if graph_type is GraphType.ERDOS_RENYI:
 
-        graph = erdosRenyi(vertices)
+        graph = erdosRenyi(vertices, rng)
 
     elif graph_type is GraphType.BARABASI_ALBERT:
 
-        graph = barabasiAlbert(vertices)
+        graph = barabasiAlbert(vertices, rng)
 
     elif graph_type is GraphType.WATTS_STROGATZ:
 
+        # built as arrays, without going through networkx
         k = 10 if vertices > 10 else vertices
-        graph = wattsStrogatz(vertices, k, 0.05)
+        return wattsStrogatzEdges(vertices, k, 0.05, rng=rng)
+
+    src = numpy.fromiter((index(i) for (i, _) in graph.edges), dtype=numpy.int64)
+    dst = numpy.fromiter((index(j) for (_, j) in graph.edges), dtype=numpy.int64)
+
+    return src, dst
+
+
+def attach_topology(descriptor):
+    """ Attach to a shared topology, only once per process.
+
+    Arguments:
+        descriptor {tuple} -- descriptor of a published SharedTopology
+
+    Returns:
+        [SharedTopology] -- zero-copy view of the topology
+    """
+
+    if descriptor not in _attached:
+        _attached[descriptor] = SharedTopology.attach(descriptor)
+
+    return _attached[descriptor]
+
+
+@contextlib.contextmanager
+def publish_topologies(graph_type, times=10, max_bound=256, seed=None):
+    """ Generate the graphs of a sweep once and publish them in shared memory, so that sweeps varying only
+    fanout, no_news or error percentage can reuse them from any worker process.
+
+    Arguments:
+        graph_type {GraphType} -- Type of the graph to be generated
+
+    Keyword Arguments:
+        times {int} -- number of graphs for each number of vertices (default: {10})
+        max_bound {int} -- maximum number of vertices (default: {256})
+        seed {int} -- seed of the topology streams, the same one given to run keeps them paired (default: {None})
+
+    Yields:
+        [dictionary] -- dictionary of key-array for vertices-descriptors of the published topologies
+    """
 
+    published = []
+
+    try:
+        topologies = {}
+
+        i = 2
+        while i <= max_bound:
+            topologies[i] = []
+
+            for t in range(times):
+                rng = RandomStreams(seed, (i, t)).topology()
+                published.append(SharedTopology.from_edges(i, *generate_edges(graph_type, i, rng)))
+                topologies[i].append(published[-1].descriptor())
+
+            i *= 2
+
+        yield topologies
+
+    finally:
+        for topology in published:
+            topology.close()
+
+
+def create_topology(graph_type, vertices, initial_value, fanout, no_news, topology=None,
+                    protocol=ProtocolType.PUSH_SUM, adaptive=False, streams=None):
+    """ Create a graph topology depending on the type
+
+    Arguments:
+        graph_type {GraphType} -- Type of the graph to be generated
+        vertices {int} -- number of vertices of the graph
+        initial_value {int or dictionary} -- initial value of each node, or the initial values by node name
+        fanout {int} -- fanout value for multicast
+        no_news {int} -- size of the no_news array
+
+    Keyword Arguments:
+        topology {tuple} -- descriptor of a published topology to use instead of generating a graph (default: {None})
+        protocol {ProtocolType} -- aggregation protocol the nodes run (default: {ProtocolType.PUSH_SUM})
+        adaptive {bool} -- let push-sum and push-pull nodes adjust their fanout, up to the given one (default: {False})
+        streams {RandomStreams} -- streams of the run, drawn from the OS entropy when not given (default: {None})
+
+    Returns:
+        [nodes] -- generated nodes
+        [distances] -- generated distances
+
+    Raises:
+        ValueError: when adaptive is asked of a protocol other than push-sum and push-pull
+    """
+
+    if adaptive and protocol not in (ProtocolType.PUSH_SUM, ProtocolType.PUSH_PULL):
+        raise ValueError("{} has no adaptive fanout".format(protocol.name))
+
+    node_type = PROTOCOLS[protocol]
+    options = {"adaptive": True} if adaptive else {}
+    streams = streams if streams is not None else RandomStreams()
+    values = initial_value if isinstance(initial_value, dict) else collections.defaultdict(lambda: initial_value)
     nodes = {}
+
+    if topology is not None:
+        distances = attach_topology(topology)
+
+        for i in distances.nodes():
+            nodes[i] = (node_type(i, distances, values[i], fanout, no_news, distances.neighbors(i),
+                                  rng=streams.peers(i), **options))
+
+        return nodes, distances
+
+    src, dst = generate_edges(graph_type, vertices, streams.topology())
+    names = vertex_names(vertices)
+
     distances = {}
-    for (src, dst) in graph.edges:
-        distances[(src, dst)] = 10
+    neighbors = {i: [] for i in names}
+    for (a, b) in zip(vertex_names(src), vertex_names(dst)):
+        distances[(a, b)] = 10
+        neighbors[a].append(b)
+        neighbors[b].append(a)
+
+    # ordered by vertex index, as in a published topology, so that both draw the same peers
+    for i in names:
+        neighbors[i].sort(key=index)
 
-    for i in graph.nodes:
-        nodes[i] = (PushSumNode(i, distances, initial_value, fanout, no_news))
+    for i in names:
+        nodes[i] = (node_type(i, distances, values[i], fanout, no_news, neighbors[i], rng=streams.peers(i),
+                              **options))
 
     return nodes, distances
 
 
-def run(graph_type, vertices, initial_value, fanout, no_news, error_percentage):
+def choose_initiators(names, initiators=("(0)",), weights="sum", rng=None):
+    """ Pick the nodes that start the protocol and the weight each of them starts with. The total weight depends
+    only on the kind of aggregate, so it is the same whatever the number of initiators.
+
+    Arguments:
+        names {array} -- names of the nodes
+
+    Keyword Arguments:
+        initiators {array or int} -- names of the initiators, or how many to pick at random (all the nodes when
+                                     as many as them) (default: {("(0)",)})
+        weights {string or array} -- "sum" to share a unit weight so that nodes estimate the sum of the values,
+                                     "average" to share one unit per node so that they estimate their average, or
+                                     the weight of each initiator (default: {"sum"})
+        rng {Generator} -- numpy generator to pick initiators with (default: {None})
+
+    Returns:
+        [array] -- names of the initiators
+        [array] -- weight of each initiator
+
+    Raises:
+        ValueError: when there are no initiators, or the weights given are not one non-negative weight per
+                    initiator with a positive total
+    """
+
+    if isinstance(initiators, int):
+        if initiators < 1:
+            raise ValueError("expected at least one initiator, got {}".format(initiators))
+
+        if initiators >= len(names):
+            initiators = list(names)
+        else:
+            rng = rng if rng is not None else numpy.random.default_rng()
+            initiators = [names[i] for i in sorted(rng.choice(len(names), initiators, replace=False).tolist())]
+
+    initiators = list(initiators)
+
+    if len(initiators) == 0:
+        raise ValueError("expected at least one initiator")
+
+    if weights == "sum":
+        weights = [1 / len(initiators)] * len(initiators)
+    elif weights == "average":
+        weights = [len(names) / len(initiators)] * len(initiators)
+    elif len(weights) != len(initiators):
+        raise ValueError("expected one weight per initiator, got {} for {}".format(len(weights), len(initiators)))
+
+    elif any(weight < 0 for weight in weights) or not sum(weights) > 0:
+        raise ValueError("expected non-negative weights adding up to more than 0, got {}".format(list(weights)))
+
+    return initiators, list(weights)
+
+
+def draw_values(names, initial_value, rng=None):
+    """ Draw the initial values of the nodes, uniformly from 0 to twice initial_value, so that they average it.
+
+    Arguments:
+        names {array} -- names of the nodes
+        initial_value {int} -- average initial value
+
+    Keyword Arguments:
+        rng {Generator} -- numpy generator to draw with (default: {None})
+
+    Returns:
+        [dictionary] -- initial value of each node
+    """
+
+    rng = rng if rng is not None else numpy.random.default_rng()
+
+    return dict(zip(names, rng.integers(0, 2 * initial_value, len(names), endpoint=True).tolist()))
+
+
+def simulate(graph_type, vertices, initial_value, fanout, no_news, error_percentage, topology=None,
+             protocol=ProtocolType.PUSH_SUM, adaptive=False, seed=None, repetition=0, initiators=("(0)",),
+             weights="sum", values="uniform", simulator=FaultySimulator, **options):
+    """ Build a configuration of a simulation and run it.
+
+    Arguments:
+        graph_type {GraphType} -- Type of the graph to be generated
+        vertices {int} -- number of vertices of the graph
+        initial_value {int} -- initial value of each node
+        fanout {int} -- fanout value for multicast
+        no_news {int} -- size of the no_news array
+        error_percentage {float} -- probability for errors to occur
+
+    Keyword Arguments:
+        topology {tuple} -- descriptor of a published topology (default: {None})
+        protocol {ProtocolType} -- aggregation protocol the nodes run (default: {ProtocolType.PUSH_SUM})
+        adaptive {bool} -- let nodes adjust their fanout, up to the given one (default: {False})
+        seed {int} -- seed of the random streams, drawn from the OS entropy when not given (default: {None})
+        repetition {int} -- repetition of the setting, telling apart the streams of runs sharing a seed (default: {0})
+        initiators {array or int} -- nodes starting the protocol at once, or how many of them to pick at random
+                                     (default: {("(0)",)})
+        weights {string or array} -- weight initialization of the initiators, see choose_initiators (default: {"sum"})
+        values {string} -- "uniform" for every node to start with initial_value, "random" to draw the values of the
+                           nodes from the streams of the run, see draw_values (default: {"uniform"})
+        simulator {class} -- simulator to run, e.g. ReferenceSimulator (default: {FaultySimulator})
+        options {any} -- further keyword arguments of the simulator, e.g. memory_budget or monitor
+
+    Returns:
+        [FaultySimulator] -- simulator after running, with its nodes
+    """
+
+    streams = RandomStreams(seed, (vertices, repetition))
+
+    if values == "random":
+        initial_value = draw_values(vertex_names(vertices), initial_value, streams.values())
+
+    nodes, distances = create_topology(graph_type, vertices, initial_value, fanout, no_news, topology, protocol,
+                                       adaptive, streams)
+
+    initiators, weights = choose_initiators(list(nodes), initiators, weights, streams.initiators())
+
+    if protocol is ProtocolType.SPANNING_TREE and len(initiators) > 1:
+        raise ValueError("the spanning tree is built from a single initiator")
+
+    faulty_sim = simulator(nodes, distances, error_percentage, 1000000, rng=streams.faults(), **options)
+
+    msgs = [(MessageType.GOSSIP, -1, (GossipType.REQUEST, 0, 0, weight)) for weight in weights]
+
+    faulty_sim.start(msgs, initiators)
+
+    return faulty_sim
+
+
+def run(graph_type, vertices, initial_value, fanout, no_news, error_percentage, topology=None,
+        protocol=ProtocolType.PUSH_SUM, adaptive=False, seed=None, repetition=0, memory_budget=None,
+        initiators=("(0)",), weights="sum"):
     """ Run a configuration of a simulation.
 
     Arguments:
@@ -58,30 +328,46 @@ def run(graph_type, vertices, initial_value, fanout, no_news, error_percentage):
         no_news {int} -- size of the no_news array
         error_percentage {float} -- probability for errors to occur
 
+    Keyword Arguments:
+        topology {tuple} -- descriptor of a published topology (default: {None})
+        protocol {ProtocolType} -- aggregation protocol the nodes run (default: {ProtocolType.PUSH_SUM})
+        adaptive {bool} -- let nodes adjust their fanout, up to the given one (default: {False})
+        seed {int} -- seed of the random streams, drawn from the OS entropy when not given (default: {None})
+        repetition {int} -- repetition of the setting, telling apart the streams of runs sharing a seed (default: {0})
+        memory_budget {int} -- bytes the simulation may take, aborting it when exceeded (default: {None})
+        initiators {array or int} -- nodes starting the protocol at once, or how many of them to pick at random
+                                     (default: {("(0)",)})
+        weights {string or array} -- weight initialization of the initiators, see choose_initiators (default: {"sum"})
+
     Returns:
         vertices [int] -- number of vertices of the graph
         current_instant [int] -- instant of time when simulator stopped
         message_count [int] -- number of messages the simulator handled
+        stats [dictionary] -- events the simulator handled, wall seconds the run took, how the simulation stopped
+                              (RunStatus) and the peak bytes of its queue, node state and output
     """
 
-    nodes, distances = create_topology(graph_type, vertices, initial_value, fanout, no_news)
+    beginning = time.perf_counter()
 
-    faulty_sim = FaultySimulator(nodes, distances, error_percentage, 1000000)
+    faulty_sim = simulate(graph_type, vertices, initial_value, fanout, no_news, error_percentage, topology, protocol,
+                          adaptive, seed, repetition, initiators, weights, memory_budget=memory_budget)
 
-    msg = (MessageType.GOSSIP, -1, (GossipType.REQUEST, 0, 0, 0))
+    delivered = faulty_sim.delivered
+    message_count = delivered[MessageType.GOSSIP] + delivered[MessageType.RETRANSMISSION] + delivered[MessageType.ACK]
 
-    events = faulty_sim.start(msg, "(0)")
+    stats = {"events": sum(delivered.values()), "wall": time.perf_counter() - beginning,
+             "status": faulty_sim.status, "memory": dict(faulty_sim.memory)}
 
-    message_count = 0
-    for event in events:
-        if event[1][2][0] is MessageType.GOSSIP or event[1][2][0] is MessageType.RETRANSMISSION or event[1][2][0] is MessageType.ACK:
-            message_count += 1
+    return vertices, faulty_sim.current_instant, message_count, stats
 
-    return vertices, faulty_sim.current_instant, message_count
 
-
-def produce_results(graph_type, initial_value, fanout, no_news, error_percentage, times=10, max_bound=256):
-    """ Produce result for many configurations of simulations.
+def produce_results(graph_type, initial_value, fanout, no_news, error_percentage, times=10, max_bound=256,
+                    topologies=None, protocol=ProtocolType.PUSH_SUM, adaptive=False, seed=None,
+                    telemetry=None, memory_budget=None, initiators=("(0)",), weights="sum"):
+    """ Produce result for many configurations of simulations. Results are kept in repetition order, and
+    repetition t of every size draws from the streams of (seed, vertices, t): sweeps given the same seed see the
+    same topologies, faults and peer choices, so they can be compared pairwise (common random numbers).
+    Runs aborted for exceeding the memory budget are logged and leave None in their place.
 
     Arguments:
         graph_type {GraphType} -- Type of the graph to be generated
@@ -93,33 +379,68 @@ def produce_results(graph_type, initial_value, fanout, no_news, error_percentage
     Keyword Arguments:
         times {int} -- number of repetitions of a specified setting (default: {10})
         max_bound {int} -- maximum number of vertices to test (default: {252})
+        topologies {dictionary} -- topologies yielded by publish_topologies, run in worker processes (default: {None})
+        protocol {ProtocolType} -- aggregation protocol the nodes run (default: {ProtocolType.PUSH_SUM})
+        adaptive {bool} -- let nodes adjust their fanout, up to the given one (default: {False})
+        seed {int} -- seed of the random streams, drawn from the OS entropy when not given (default: {None})
+        telemetry {SweepTelemetry} -- tracks the progress of the sweep, e.g. to poll it from another thread
+                                      (default: {one logging every 30 seconds})
+        memory_budget {int} -- bytes each run may take, aborting it when exceeded (default: {None})
+        initiators {array or int} -- nodes starting each run, or how many of them to pick at random (default: {("(0)",)})
+        weights {string or array} -- weight initialization of the initiators, see choose_initiators (default: {"sum"})
 
     Returns:
         durations [dictionary] -- dictionary of key-array for vertices-values respecting to times
         messages [dictionary] -- dictionary of key-array for vertices-values respecting to messages
     """
 
-    with concurrent.futures.ThreadPoolExecutor(max_workers=10) as executor:
+    max_workers = 10
+
+    if topologies is not None:
+        executor = concurrent.futures.ProcessPoolExecutor(max_workers=max_workers)
+    else:
+        executor = concurrent.futures.ThreadPoolExecutor(max_workers=max_workers)
+
+    if seed is None:
+        seed = numpy.random.SeedSequence().entropy
+
+    if telemetry is None:
+        telemetry = SweepTelemetry()
+
+    telemetry.begin("{} {} fanout={} no_news={} loss={}".format(graph_type.name, protocol.name, fanout, no_news,
+                                                               error_percentage), max_workers)
+
+    with executor:
 
         durations = {}
         messages = {}
-        workers = []
+        workers = {}
 
         i = 2
         while i <= max_bound:
-            durations[i] = []
-            messages[i] = []
+            durations[i] = [None] * times
+            messages[i] = [None] * times
 
-            for _ in range(times):
-                workers.append(executor.submit(run, graph_type, i, initial_value, fanout, no_news, error_percentage))
+            for t in range(times):
+                topology = topologies[i][t] if topologies is not None else None
+                worker = executor.submit(run, graph_type, i, initial_value, fanout, no_news, error_percentage,
+                                         topology, protocol, adaptive, seed, t, memory_budget, initiators, weights)
+                workers[worker] = t
+                telemetry.submitted(worker, i, t)
 
             i *= 2
 
         # append all the execution results to the respective dictionaries
-        for worker in concurrent.futures.as_completed(workers):
-            vertices, duration, message_count = worker.result()
-            durations[vertices].append(duration)
-            messages[vertices].append(message_count)
+        for worker in telemetry.as_completed(workers):
+            vertices, duration, message_count, stats = worker.result()
+
+            if stats["status"] is RunStatus.MEMORY_LIMIT:
+                logger.warning("run %d of %d vertices aborted at %s ms, over the memory budget: %s", workers[worker],
+                               vertices, duration, stats["memory"])
+                continue
+
+            durations[vertices][workers[worker]] = duration
+            messages[vertices][workers[worker]] = message_count
 
         return durations, messages
 
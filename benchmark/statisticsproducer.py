@@ -1,8 +1,10 @@
-from statistics import mean
+from statistics import mean, stdev
 import matplotlib.pyplot as plt
+import numpy
 
-from benchmark.resultsproducer import produce_results
+from benchmark.resultsproducer import produce_results, publish_topologies
 from network.graphtype import GraphType
+from nodes.protocoltype import ProtocolType
 
 
 def calculate_points(dictionary):
@@ -19,12 +21,114 @@ def calculate_points(dictionary):
     x = []
     y = []
     for key, value in dictionary.items():
-        x.append(key)
-        y.append(mean(value))
+        # aborted runs have no value
+        value = [v for v in value if v is not None]
+        if value:
+            x.append(key)
+            y.append(mean(value))
 
     return x, y
 
 
+def paired_differences(first, second):
+    """ Average difference between two sweeps run with the same seed, repetition by repetition, and its standard
+    error. Under common random numbers the noise the sweeps share cancels out, so far fewer repetitions are needed
+    to tell them apart than when comparing their averages.
+
+    Arguments:
+        first {dictionary} -- data struct that holds an array of values for each key, in repetition order
+        second {dictionary} -- data struct with the same keys and repetitions
+
+    Returns:
+        [dictionary] -- dictionary of key-pair for vertices-(mean difference, standard error)
+    """
+
+    res = {}
+    for key, value in first.items():
+        differences = [a - b for a, b in zip(value, second[key]) if a is not None and b is not None]
+        if not differences:
+            continue
+
+        error = stdev(differences) / len(differences) ** 0.5 if len(differences) > 1 else 0
+        res[key] = (mean(differences), error)
+
+    return res
+
+
+def compare_settings(graph_type, initial_value, settings, times=10, max_bound=256, common=True, seed=None):
+    """ Produce the results of several settings, e.g. different fanouts or no news sizes.
+
+    Arguments:
+        graph_type {GraphType} -- Type of the graph to be generated
+        initial_value {int} -- initial value of each node
+        settings {array} -- (name, keyword arguments of produce_results) pairs, e.g.
+                            ("fanout 2", {"fanout": 2, "no_news": 5, "error_percentage": 0.05})
+
+    Keyword Arguments:
+        times {int} -- number of repetitions of a specified setting (default: {10})
+        max_bound {int} -- maximum number of vertices to test (default: {256})
+        common {bool} -- run every setting on the same graphs and random streams (common random numbers), instead
+                         of independent ones (default: {True})
+        seed {int} -- seed of the sweep, drawn from the OS entropy when not given (default: {None})
+
+    Returns:
+        [array] -- (name, durations, messages) triplets, to be compared with paired_differences when common
+    """
+
+    seeds = numpy.random.SeedSequence(seed).generate_state(len(settings), numpy.uint32).tolist()
+    if common:
+        seeds = [seeds[0]] * len(settings)
+
+    res = []
+
+    for (name, options), setting_seed in zip(settings, seeds):
+
+        with publish_topologies(graph_type, times, max_bound, setting_seed) as topologies:
+
+            durations, messages = produce_results(graph_type, initial_value, times=times, max_bound=max_bound,
+                                                  topologies=topologies, seed=setting_seed, **options)
+
+        res.append((name, durations, messages))
+
+    return res
+
+
+def compare_protocols(graph_type, initial_value, fanout, no_news, error_percentage, protocols=tuple(ProtocolType),
+                      times=10, max_bound=256, seed=None):
+    """ Produce the points of several protocols, all of them running on the same graphs and random streams.
+
+    Arguments:
+        graph_type {GraphType} -- Type of the graph to be generated
+        initial_value {int} -- initial value of each node
+        fanout {int} -- fanout value for multicast
+        no_news {int} -- size of the no_news array
+        error_percentage {float} -- probability for errors to occur
+
+    Keyword Arguments:
+        protocols {tuple} -- protocols to compare (default: {every ProtocolType})
+        times {int} -- number of repetitions of a specified setting (default: {10})
+        max_bound {int} -- maximum number of vertices to test (default: {256})
+        seed {int} -- seed of the random streams, drawn from the OS entropy when not given (default: {None})
+
+    Returns:
+        [array] -- (protocol name, points) pairs ready for draw_plot
+    """
+
+    res = []
+
+    seed = numpy.random.SeedSequence(seed).entropy
+
+    with publish_topologies(graph_type, times, max_bound, seed) as topologies:
+
+        for protocol in protocols:
+            durations, messages = produce_results(graph_type, initial_value, fanout, no_news, error_percentage, times,
+                                                  max_bound, topologies, protocol, seed=seed)
+
+            res.append((protocol.name, calculate_points(durations) + calculate_points(messages)))
+
+    return res
+
+
 def draw_plot(*args):
     """
     Draw a plot of time and message complexities given a bunch of arrays
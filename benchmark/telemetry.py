@@ -0,0 +1,227 @@
+import collections
+import concurrent.futures
+import logging
+import math
+import threading
+import time
+from statistics import mean
+
+
+# snapshot of the progress of a sweep
+SweepStats = collections.namedtuple("SweepStats", ["label", "completed", "running", "queued", "events_per_second",
+                                                   "eta", "slowest"])
+
+
+class SweepTelemetry:
+    """ Tracks the runs of a sweep while they execute, logging its progress periodically. stats() can be polled
+    from another thread at any time.
+
+    Runs are seen as started when their future is marked running, which happens when a worker picks them up
+    (process pools may mark one more run than there are workers).
+    """
+
+    def __init__(self, interval=30, slowest=3, logger=None):
+        """ Constructor for a SweepTelemetry.
+
+        Keyword Arguments:
+            interval {float} -- seconds between log lines (default: {30})
+            slowest {int} -- number of in-flight runs reported as the slowest (default: {3})
+            logger {Logger} -- logger to write to (default: {the logger of this module})
+
+        Instantiated Attributes:
+            interval {float} -- seconds between log lines
+            slowest {int} -- number of in-flight runs reported as the slowest
+            logger {Logger} -- logger written to
+            label {string} -- configuration of the sweep
+            workers {int} -- number of workers running the sweep
+            runs {dictionary} -- (vertices, repetition) of each run not completed yet, by future
+            started {dictionary} -- time each in-flight run started, by future
+            costs {dictionary} -- wall seconds of the completed runs, by number of vertices
+            events {int} -- events handled by the completed runs
+            busy {float} -- wall seconds spent on the completed runs
+            completed {int} -- number of completed runs
+            last_completion {float} -- time the last completed run was collected
+            last_log {float} -- time of the last log line
+            __lock {Lock} -- guards the counters against stats() calls from other threads
+        """
+
+        self.interval = interval
+        self.slowest = slowest
+        self.logger = logger if logger is not None else logging.getLogger(__name__)
+
+        self.label = ""
+        self.workers = 1
+
+        self.runs = {}
+        self.started = {}
+        self.costs = {}
+
+        self.events = 0
+        self.busy = 0
+        self.completed = 0
+
+        self.last_completion = self.last_log = time.perf_counter()
+
+        self.__lock = threading.Lock()
+
+    def begin(self, label, workers):
+        """ Start tracking a sweep.
+
+        Arguments:
+            label {string} -- configuration of the sweep
+            workers {int} -- number of workers running it
+        """
+
+        with self.__lock:
+            self.label = label
+            self.workers = workers
+            self.last_completion = self.last_log = time.perf_counter()
+
+    def submitted(self, future, vertices, repetition):
+        """ Track a run handed to the executor.
+
+        Arguments:
+            future {Future} -- future of the run
+            vertices {int} -- number of vertices of the run
+            repetition {int} -- repetition of the run
+        """
+
+        with self.__lock:
+            self.runs[future] = (vertices, repetition)
+
+    def as_completed(self, futures):
+        """ Yield the futures as they complete, like concurrent.futures.as_completed, updating the telemetry
+        between completions.
+
+        Arguments:
+            futures {iterable} -- futures of the runs
+
+        Yields:
+            [Future] -- completed future
+        """
+
+        pending = set(futures)
+
+        while pending:
+            done, pending = concurrent.futures.wait(pending, timeout=min(self.interval, 1),
+                                                    return_when=concurrent.futures.FIRST_COMPLETED)
+
+            now = time.perf_counter()
+
+            with self.__lock:
+                for future in done:
+                    self.__finished__(future, now)
+
+                # a worker only picks a run up when another one ends
+                for future in pending:
+                    if future not in self.started and future.running():
+                        self.started[future] = self.last_completion
+
+            if now - self.last_log >= self.interval:
+                self.last_log = now
+                self.logger.info(self.line())
+
+            yield from done
+
+        self.logger.info(self.line())
+
+    def stats(self):
+        """ Current progress of the sweep.
+
+        Returns:
+            [SweepStats] -- completed, running and queued runs, events per wall second of a worker, estimated
+                            seconds left (None until some run completed) and the slowest in-flight runs as
+                            (vertices, repetition, elapsed seconds, expected seconds) tuples
+        """
+
+        with self.__lock:
+            now = time.perf_counter()
+
+            running = [(self.runs[future], now - start) for future, start in self.started.items()]
+            queued = [self.runs[future] for future in self.runs if future not in self.started]
+
+            expected = {vertices: self.__cost__(vertices) for vertices, _ in list(self.runs.values())}
+
+            eta = None
+            if all(cost is not None for cost in expected.values()):
+                # runs past their expected cost are assumed to be halfway
+                remaining = [expected[vertices] - elapsed if elapsed < expected[vertices] else elapsed
+                             for (vertices, _), elapsed in running]
+
+                left = sum(expected[vertices] for vertices, _ in queued) + sum(remaining)
+                eta = max([left / self.workers] + remaining)
+
+            running.sort(key=lambda run: run[1], reverse=True)
+            slowest = [(vertices, repetition, elapsed, expected[vertices])
+                       for (vertices, repetition), elapsed in running[:self.slowest]]
+
+            return SweepStats(self.label, self.completed, len(running), len(queued),
+                              self.events / self.busy if self.busy > 0 else 0, eta, slowest)
+
+    def line(self):
+        """ Progress of the sweep as a log line.
+
+        Returns:
+            [string] -- log line
+        """
+
+        stats = self.stats()
+
+        slowest = ", ".join("{}v #{} {:.0f}s".format(vertices, repetition, elapsed)
+                            for vertices, repetition, elapsed, _ in stats.slowest)
+
+        return "{}: {} done, {} running, {} queued, {:.0f} events/s per worker, eta {}{}".format(
+            stats.label, stats.completed, stats.running, stats.queued, stats.events_per_second,
+            "?" if stats.eta is None else "{:.0f}s".format(stats.eta), ", slowest " + slowest if slowest else "")
+
+    def __finished__(self, future, now):
+        """ Account for a completed run.
+
+        Arguments:
+            future {Future} -- future of the run
+            now {float} -- time it was collected
+        """
+
+        vertices, _ = self.runs.pop(future)
+        self.started.pop(future, None)
+
+        self.completed += 1
+        self.last_completion = now
+
+        if future.cancelled() or future.exception() is not None:
+            return
+
+        stats = future.result()[-1]
+
+        self.costs.setdefault(vertices, []).append(stats["wall"])
+        self.events += stats["events"]
+        self.busy += stats["wall"]
+
+    def __cost__(self, vertices):
+        """ Expected wall seconds of a run, from the completed runs of the same size, or extrapolated from the two
+        largest sizes completed so far (quadratic growth is assumed until there are two).
+
+        Arguments:
+            vertices {int} -- number of vertices of the run
+
+        Returns:
+            [float] -- expected seconds, None while no run completed
+        """
+
+        if vertices in self.costs:
+            return mean(self.costs[vertices])
+
+        if not self.costs:
+            return None
+
+        sizes = sorted(self.costs)
+        below = [size for size in sizes if size < vertices]
+        nearest = below[-1] if below else sizes[0]
+
+        exponent = 2
+        if len(sizes) > 1:
+            small, large = sizes[-2], sizes[-1]
+            ratio = max(mean(self.costs[large]), 1e-9) / max(mean(self.costs[small]), 1e-9)
+            exponent = min(max(math.log(ratio) / math.log(large / small), 1), 3)
+
+        return mean(self.costs[nearest]) * (vertices / nearest) ** exponent
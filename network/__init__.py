@@ -1 +1 @@
-__all__ = ["graphAlgorithm", "graphtype", "probabilities"]
+__all__ = ["graphAlgorithm", "graphtype", "probabilities", "sharedtopology"]
@@ -1,57 +1,67 @@
 import matplotlib.pyplot as plt
 import networkx as nx
-from random import randrange
+import numpy
 from network.probabilities import calculate_probability, preferential_attachment
 
 
-def erdosRenyi(num_vertices):
+def erdosRenyi(num_vertices, rng=None):
     """ Create a connected component with Erdos Renyi algorithm
 
     Arguments:
         num_vertices {int} -- number of vertices for the graph
 
+    Keyword Arguments:
+        rng {Generator} -- numpy generator to draw from, seeded from the OS entropy when not given (default: {None})
+
     Returns:
         [Graph] -- constructed graph
     """
 
+    rng = rng if rng is not None else numpy.random.default_rng()
+
     graph = nx.Graph()
     for x in range(num_vertices):
         graph.add_node("(" + str(x) + ")")
 
     while not nx.is_connected(graph):
-        i = randrange(num_vertices)
-        j = randrange(num_vertices)
+        i = rng.integers(num_vertices)
+        j = rng.integers(num_vertices)
         if i != j:
             graph.add_edge("(" + str(i) + ")", "(" + str(j) + ")")
 
     return graph
 
 
-def barabasiAlbert(num_vertices):
+def barabasiAlbert(num_vertices, rng=None):
     """ Create a connected component with Barabasi Albert algorithm
 
     Arguments:
         num_vertices {int} -- number of vertices for the graph
 
+    Keyword Arguments:
+        rng {Generator} -- numpy generator to draw from, seeded from the OS entropy when not given (default: {None})
+
     Returns:
         [Graph] -- constructed graph
     """
 
+    rng = rng if rng is not None else numpy.random.default_rng()
+
     graph = nx.Graph()
     for x in range(num_vertices):
         graph.add_node("(" + str(x) + ")")
 
     while not nx.is_connected(graph):
         probabilities = calculate_probability(graph, num_vertices)
-        i = preferential_attachment(num_vertices, probabilities)
-        j = preferential_attachment(num_vertices, probabilities)
+        i = preferential_attachment(num_vertices, probabilities, rng)
+        j = preferential_attachment(num_vertices, probabilities, rng)
         if i != j:
             graph.add_edge("(" + str(i) + ")", "(" + str(j) + ")")
 
     return graph
 
 
-def wattsStrogatz(num_vertices, nearest_neighbors, rewiring_probability):
+def wattsStrogatz(num_vertices, nearest_neighbors, rewiring_probability, rng=None):
     """ Create a connected component with Watts Strogatz algorithm
 
     Arguments:
@@ -59,32 +69,169 @@ def wattsStrogatz(num_vertices, nearest_neighbors, rewiring_probability):
         nearest_neighbors {int} -- each node is joined with its k nearest neighbors in a ring topology
         rewiring_probability {float} -- the probability of rewiring each edge
 
+    Keyword Arguments:
+        rng {Generator} -- numpy generator to draw from, seeded from the OS entropy when not given (default: {None})
+
     Returns:
         [Graph] -- constructed graph
     """
 
-    return adapt_graph(nx.connected_watts_strogatz_graph(num_vertices, nearest_neighbors, rewiring_probability, tries=100000))
+    src, dst = wattsStrogatzEdges(num_vertices, nearest_neighbors, rewiring_probability, rng=rng)
+
+    graph = nx.Graph()
+    graph.add_nodes_from(vertex_names(num_vertices))
+    graph.add_edges_from(zip(vertex_names(src), vertex_names(dst)))
+
+    return graph
 
 
-def adapt_graph(g):
-    """ Adapt a graph to a desired form.
+def wattsStrogatzEdges(num_vertices, nearest_neighbors, rewiring_probability, max_tries=100, rng=None):
+    """ Create the edges of a connected component with Watts Strogatz algorithm, as arrays of vertex indexes.
+    Edges are rewired in place and disconnected components are linked to the largest one, instead of generating
+    whole graphs until a connected one comes up.
 
     Arguments:
-        g {Graph} -- graph to be adapted
+        num_vertices {int} -- number of vertices for the graph
+        nearest_neighbors {int} -- each node is joined with its k nearest neighbors in a ring topology
+        rewiring_probability {float} -- the probability of rewiring each edge
+
+    Keyword Arguments:
+        max_tries {int} -- attempts to find a free endpoint for a rewired edge before keeping it (default: {100})
+        rng {Generator} -- numpy generator to draw from, seeded from the OS entropy when not given (default: {None})
 
     Returns:
-        [Graph] -- constructed graph
+        [ndarray] -- first endpoint of each edge
+        [ndarray] -- second endpoint of each edge
     """
 
-    graph = nx.Graph()
-    for node in nx.nodes(g):
-        graph.add_node("(" + str(node) + ")")
+    n = num_vertices
+    rng = rng if rng is not None else numpy.random.default_rng()
 
-    for (i, j) in nx.edges(g):
-        if i != j:
-            graph.add_edge("(" + str(i) + ")", "(" + str(j) + ")")
+    # as many neighbors as vertices makes a complete graph
+    if nearest_neighbors >= n:
+        src, dst = numpy.triu_indices(n, 1)
+        return src.astype(numpy.int64), dst.astype(numpy.int64)
 
-    return graph
+    half = nearest_neighbors // 2
+
+    # ring lattice, each vertex linked to its half k following vertices
+    src = numpy.tile(numpy.arange(n, dtype=numpy.int64), half)
+    dst = (src + numpy.repeat(numpy.arange(1, half + 1, dtype=numpy.int64), n)) % n
+
+    # rewiring the second endpoint of some edges, retrying the ones that became loops or duplicates
+    lattice = dst.copy()
+    rewired = numpy.flatnonzero(rng.random(len(src)) < rewiring_probability)
+
+    for _ in range(max_tries):
+        if len(rewired) == 0:
+            break
+
+        dst[rewired] = rng.integers(0, n, len(rewired))
+        rewired = rewired[invalid_edges(n, src, dst, rewired)]
+
+    # edges that found no free endpoint go back to the lattice, dropped if it was taken meanwhile
+    if len(rewired) > 0:
+        dst[rewired] = lattice[rewired]
+
+        valid = numpy.ones(len(src), dtype=bool)
+        valid[rewired[invalid_edges(n, src, dst, rewired)]] = False
+        src, dst = src[valid], dst[valid]
+
+    return connect_components(n, src, dst, rng)
+
+
+def invalid_edges(num_vertices, src, dst, candidates):
+    """ Find which of some edges are loops or duplicate other edges. Among duplicates, edges that are not
+    candidates are kept, then the candidate that comes first.
+
+    Arguments:
+        num_vertices {int} -- number of vertices for the graph
+        src {ndarray} -- first endpoint of each edge
+        dst {ndarray} -- second endpoint of each edge
+        candidates {ndarray} -- indexes of the edges to check
+
+    Returns:
+        [ndarray] -- mask of the invalid candidates
+    """
+
+    keys = numpy.minimum(src, dst) * num_vertices + numpy.maximum(src, dst)
+
+    moving = numpy.zeros(len(src), dtype=bool)
+    moving[candidates] = True
+
+    # equal keys together, with the edges that are not candidates first
+    order = numpy.lexsort((moving, keys))
+    sorted_keys = keys[order]
+
+    duplicate = numpy.zeros(len(src), dtype=bool)
+    duplicate[order[1:]] = sorted_keys[1:] == sorted_keys[:-1]
+
+    return (src[candidates] == dst[candidates]) | duplicate[candidates]
+
+
+def connect_components(num_vertices, src, dst, rng=None):
+    """ Link every connected component to the largest one with a single edge.
+
+    Arguments:
+        num_vertices {int} -- number of vertices for the graph
+        src {ndarray} -- first endpoint of each edge
+        dst {ndarray} -- second endpoint of each edge
+
+    Keyword Arguments:
+        rng {Generator} -- numpy generator to draw from, seeded from the OS entropy when not given (default: {None})
+
+    Returns:
+        [ndarray] -- first endpoint of each edge
+        [ndarray] -- second endpoint of each edge
+    """
+
+    rng = rng if rng is not None else numpy.random.default_rng()
+
+    # labelling each vertex with the lowest index in its component
+    labels = numpy.arange(num_vertices, dtype=numpy.int64)
+
+    while True:
+        hooked = labels.copy()
+        numpy.minimum.at(hooked, src, labels[dst])
+        numpy.minimum.at(hooked, dst, labels[src])
+        hooked = hooked[hooked]
+
+        if numpy.array_equal(hooked, labels):
+            break
+
+        labels = hooked
+
+    roots, sizes = numpy.unique(labels, return_counts=True)
+
+    if len(roots) <= 1:
+        return src, dst
+
+    largest = roots[numpy.argmax(sizes)]
+    others = roots[roots != largest]
+    members = numpy.flatnonzero(labels == largest)
+
+    src = numpy.concatenate((src, others))
+    dst = numpy.concatenate((dst, members[rng.integers(0, len(members), len(others))]))
+
+    return src, dst
+
+
+def vertex_names(indexes):
+    """ Names of vertices, "(i)" for index i.
+
+    Arguments:
+        indexes {int or ndarray} -- number of vertices, or their indexes
+
+    Returns:
+        [array] -- vertex names
+    """
+
+    if isinstance(indexes, int):
+        indexes = range(indexes)
+    else:
+        indexes = indexes.tolist()
+
+    return ["(" + str(i) + ")" for i in indexes]
 
 
 if __name__ == "__main__":
@@ -26,13 +26,16 @@ def calculate_probability(graph, num):
     return prob_list
 
 
-def preferential_attachment(num, probs):
+def preferential_attachment(num, probs, rng=None):
     """ Make a choice given a list of probabilities
 
     Arguments:
         num {int} -- number of vertices of the graph
         probs {array} --  probabilities associated to each node
 
+    Keyword Arguments:
+        rng {Generator} -- numpy generator to draw from, seeded from the OS entropy when not given (default: {None})
+
     Returns:
         [int] -- chosen node
     """
@@ -40,4 +43,6 @@ def preferential_attachment(num, probs):
     if num == 0:
         return 0
 
-    return numpy.random.choice(numpy.arange(0, num), p=probs)
+    rng = rng if rng is not None else numpy.random.default_rng()
+
+    return rng.choice(numpy.arange(0, num), p=probs)
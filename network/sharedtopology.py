@@ -0,0 +1,240 @@
+from collections.abc import Mapping
+from multiprocessing import shared_memory
+
+import numpy
+
+
+class SharedTopology(Mapping):
+    """ Read-only topology stored as adjacency arrays (CSR) in a shared memory block.
+
+    The block holds three int64 arrays one after the other:
+        offsets [n + 1] -- position in targets where the neighbors of each vertex start
+        targets [2m] -- neighbor indexes of every vertex
+        latencies [2m] -- latency of the link to each neighbor in targets
+
+    Vertices are named "(i)" like the rest of the network package. The object behaves as the distances
+    dictionary used by the simulator ({(src, dst): distance}), so it can be handed to FaultySimulator
+    and PushSumNode as is.
+
+    Arguments:
+        Mapping {Mapping} -- interface to implement
+    """
+
+    def __init__(self, memory, num_vertices, num_edges, owner=False):
+        """ Constructor for a SharedTopology. Use from_edges or attach instead of calling it directly.
+
+        Arguments:
+            memory {SharedMemory} -- shared memory block holding the arrays
+            num_vertices {int} -- number of vertices of the graph
+            num_edges {int} -- number of undirected edges of the graph
+
+        Keyword Arguments:
+            owner {bool} -- whether this process created the block and must unlink it (default: {False})
+
+        Instantiated Attributes:
+            memory {SharedMemory} -- shared memory block holding the arrays
+            num_vertices {int} -- number of vertices of the graph
+            num_edges {int} -- number of undirected edges of the graph
+            owner {bool} -- whether this process created the block
+            offsets {ndarray} -- zero-copy view of the offsets array
+            targets {ndarray} -- zero-copy view of the targets array
+            latencies {ndarray} -- zero-copy view of the latencies array
+        """
+
+        self.memory = memory
+        self.num_vertices = num_vertices
+        self.num_edges = num_edges
+        self.owner = owner
+
+        buffer = numpy.ndarray((num_vertices + 1 + 4 * num_edges,), dtype=numpy.int64, buffer=memory.buf)
+
+        self.offsets = buffer[:num_vertices + 1]
+        self.targets = buffer[num_vertices + 1:num_vertices + 1 + 2 * num_edges]
+        self.latencies = buffer[num_vertices + 1 + 2 * num_edges:]
+
+    @classmethod
+    def from_edges(cls, num_vertices, src, dst, distance=10):
+        """ Build the adjacency arrays of an undirected edge list straight into a new shared memory block.
+
+        Arguments:
+            num_vertices {int} -- number of vertices of the graph
+            src {ndarray} -- first endpoint index of each edge
+            dst {ndarray} -- second endpoint index of each edge
+
+        Keyword Arguments:
+            distance {int} -- latency of every link (default: {10})
+
+        Returns:
+            [SharedTopology] -- topology owned by the calling process
+        """
+
+        num_edges = len(src)
+
+        # both directions of every edge, grouped by origin and sorted by end so links can be binary searched
+        origins = numpy.concatenate((src, dst))
+        ends = numpy.concatenate((dst, src))
+        order = numpy.lexsort((ends, origins))
+
+        size = (num_vertices + 1 + 4 * num_edges) * numpy.dtype(numpy.int64).itemsize
+        memory = shared_memory.SharedMemory(create=True, size=max(size, 1))
+
+        topology = cls(memory, num_vertices, num_edges, owner=True)
+        topology.offsets[0] = 0
+        numpy.cumsum(numpy.bincount(origins, minlength=num_vertices), out=topology.offsets[1:])
+        topology.targets[:] = ends[order]
+        topology.latencies[:] = distance
+
+        return topology
+
+    @classmethod
+    def attach(cls, descriptor):
+        """ Attach to a topology published by another process, without copying it.
+
+        Arguments:
+            descriptor {tuple} -- value returned by descriptor() in the publishing process
+
+        Returns:
+            [SharedTopology] -- topology view
+        """
+
+        name, num_vertices, num_edges = descriptor
+
+        return cls(shared_memory.SharedMemory(name=name), num_vertices, num_edges)
+
+    def descriptor(self):
+        """ Picklable handle that other processes can attach to.
+
+        Returns:
+            [tuple] -- (block name, number of vertices, number of edges)
+        """
+
+        return self.memory.name, self.num_vertices, self.num_edges
+
+    def nodes(self):
+        """ Names of the vertices of the graph.
+
+        Returns:
+            [array] -- vertex names
+        """
+
+        return [name(i) for i in range(self.num_vertices)]
+
+    def neighbors(self, node):
+        """ Direct neighbors of a vertex.
+
+        Arguments:
+            node {string} -- vertex name
+
+        Returns:
+            [array] -- neighbor names
+        """
+
+        i = index(node)
+
+        return [name(j) for j in self.targets[self.offsets[i]:self.offsets[i + 1]].tolist()]
+
+    def links(self, node):
+        """ Latency of the link to each direct neighbor of a vertex, read from its slice of the arrays.
+
+        Arguments:
+            node {string} -- vertex name
+
+        Returns:
+            [dictionary] -- latency by neighbor name
+        """
+
+        i = index(node)
+        start, end = self.offsets[i], self.offsets[i + 1]
+
+        return dict(zip([name(j) for j in self.targets[start:end].tolist()], self.latencies[start:end].tolist()))
+
+    def close(self):
+        """ Detach from the shared memory block, removing it if this process published it.
+        """
+
+        # views must be released before the block can be closed
+        self.offsets = self.targets = self.latencies = None
+
+        self.memory.close()
+
+        if self.owner:
+            self.memory.unlink()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __lookup__(self, key):
+        """ Position of a link in the targets array.
+
+        Arguments:
+            key {(string, string)} -- pair of vertex names
+
+        Returns:
+            [int] -- position of the link, -1 if it does not exist
+        """
+
+        try:
+            src, dst = index(key[0]), index(key[1])
+        except (TypeError, ValueError, IndexError):
+            return -1
+
+        if not 0 <= src < self.num_vertices:
+            return -1
+
+        start, end = self.offsets[src], self.offsets[src + 1]
+        position = start + numpy.searchsorted(self.targets[start:end], dst)
+
+        if position < end and self.targets[position] == dst:
+            return position
+
+        return -1
+
+    def __getitem__(self, key):
+        position = self.__lookup__(key)
+
+        if position < 0:
+            raise KeyError(key)
+
+        return int(self.latencies[position])
+
+    def __contains__(self, key):
+        return self.__lookup__(key) >= 0
+
+    def __iter__(self):
+        # every undirected edge once
+        for i in range(self.num_vertices):
+            for j in self.targets[self.offsets[i]:self.offsets[i + 1]].tolist():
+                if i < j:
+                    yield name(i), name(j)
+
+    def __len__(self):
+        return self.num_edges
+
+
+def name(i):
+    """ Name of the vertex with a given index.
+
+    Arguments:
+        i {int} -- vertex index
+
+    Returns:
+        [string] -- vertex name
+    """
+
+    return "(" + str(i) + ")"
+
+
+def index(node):
+    """ Index of the vertex with a given name.
+
+    Arguments:
+        node {string} -- vertex name
+
+    Returns:
+        [int] -- vertex index
+    """
+
+    return int(node[1:-1])
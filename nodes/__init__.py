@@ -1 +1 @@
-__all__ = ["node", "pushsum", "boundedqueue"]
+__all__ = ["node", "pushsum", "pushpull", "flowupdating", "spanningtree", "vectorpushsum", "boundedqueue", "protocoltype"]
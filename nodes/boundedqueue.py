@@ -1,3 +1,6 @@
+import numpy
+
+
 class BoundedQueue:
     """ 
     Implementation of a bounded queue with 2 methods.
@@ -47,6 +50,104 @@ class BoundedQueue:
 
         return True
 
+    def count(self, elem):
+        """ Count how many of the most recent values in the queue are equal to a given element.
+
+        Arguments:
+            elem {any} -- element to compare with the values in the queue
+
+        Returns:
+            int -- number of consecutive values, from the newest, equal to the element
+        """
+
+        count = 0
+
+        for value in reversed(self.__queue):
+            if value != elem:
+                break
+
+            count += 1
+
+        return count
+
+
+class BoundedArrayQueue:
+    """
+    Bounded queue of equally sized arrays with the same 2 methods as BoundedQueue, compared component by component.
+    """
+
+    def __init__(self, size, length, convergence="component", tolerance=1e-3):
+        """ Constructor for a Bounded Array Queue.
+
+        Arguments:
+            size {int} -- size of the queue
+            length {int} -- number of components of each array
+
+        Keyword Arguments:
+            convergence {string} -- "component" for every component to repeat its value, "worst" for the component
+                                    that changed the most to stay within tolerance (default: {"component"})
+            tolerance {float} -- relative change allowed in "worst" convergence (default: {1e-3})
+
+        Instantiated Attributes:
+            size {int} -- maximum size of the queue
+            convergence {string} -- convergence rule
+            tolerance {float} -- relative change allowed in "worst" convergence
+            settled {ndarray} -- components that matched the queue in the last comparison
+            __queue {ndarray} -- ring buffer with one array per row
+            __count {int} -- number of rows in use
+            __next {int} -- row to write next
+        """
+
+        if convergence not in ("component", "worst"):
+            raise ValueError("unknown convergence rule: {}".format(convergence))
+
+        self.size = size
+        self.convergence = convergence
+        self.tolerance = tolerance
+        self.settled = numpy.zeros(length, dtype=bool)
+        self.__queue = numpy.zeros((size, length))
+        self.__count = 0
+        self.__next = 0
+
+    def add(self, elem):
+        """ Add an array to the queue, replacing the oldest if needed to maintain the maximum size of the queue
+
+        Arguments:
+            elem {ndarray} -- array to add to the queue
+        """
+
+        if self.size == 0:
+            return
+
+        self.__queue[self.__next] = elem
+        self.__next = (self.__next + 1) % self.size
+        self.__count = min(self.__count + 1, self.size)
+
+    def compare(self, elem):
+        """ Compare a given array with the arrays in the queue.
+
+        Arguments:
+            elem {ndarray} -- array to compare with the arrays in the queue
+
+        Returns:
+            Boolean -- True if the array matches every array in the queue under the convergence rule, False otherwise
+        """
+
+        if self.__count == 0:
+            self.settled[:] = False
+            return False
+
+        queue = self.__queue[:self.__count]
+
+        if self.convergence == "component":
+            self.settled = (queue == elem).all(axis=0)
+            return bool(self.settled.all())
+
+        change = numpy.abs(queue - elem).max(axis=0) / numpy.maximum(numpy.abs(elem), 1e-12)
+        self.settled = change <= self.tolerance
+
+        return bool(change.max() <= self.tolerance)
+
 
 if __name__ == "__main__":
     queue = BoundedQueue(3)
@@ -0,0 +1,283 @@
+from .boundedqueue import BoundedQueue
+from .node import Node
+from .pushsum import PushSumNode, MessageType, GossipType
+
+
+class FlowUpdatingNode(Node):
+    """ Class that implements flow-updating over sum and weight pairs. Nodes never move their values, they keep
+    a flow to each neighbor and every round send it with their estimate to all of them. Messages carry the whole
+    state of a link, so a lost message is repaired by the next one and no acknowledgments or retransmissions are
+    needed.
+
+    Arguments:
+        Node {Node} -- interface to implement
+    """
+
+    def __init__(self, id, distances, initial_value, fanout, nonews, neighbors=None, period=20, rng=None):
+        """ Constructor for the FlowUpdatingNode
+
+        Arguments:
+            id {int} -- node id
+            distances {dictionary} -- dictionary of pairs and distances
+            initial_value {int} -- value that a node holds
+            fanout {int} -- unused, every round reaches all the neighbors
+            nonews {int} -- number of the no news array
+
+        Keyword Arguments:
+            neighbors {array} -- direct neighbors, found by scanning distances when not given (default: {None})
+            period {int} -- time between rounds in milliseconds (default: {20})
+            rng {Random} -- unused, no peers are picked (default: {None})
+
+        Instantiated Attributes:
+            id {int} -- node id
+            message_id {int} -- # unique message ids
+            value {(float, float)} -- sum and weight the node holds
+            sum {float} -- sum estimate
+            weight {float} -- weight estimate
+            aggregate {float} -- aggregate calculated value
+            neighbors {array} -- direct neighbors
+            period {int} -- time between rounds
+            flows {dictionary} -- sum and weight flowing to each neighbor
+            estimates {dictionary} -- last sum and weight estimate of each neighbor
+            ticking {bool} -- whether a round is scheduled
+            no_news {BoundedQueue} -- Termination info
+        """
+
+        self.id = id
+
+        self.message_id = -1
+
+        self.value = (initial_value, 0)
+
+        self.sum, self.weight = self.value
+        self.aggregate = initial_value
+
+        if neighbors is not None:
+            self.neighbors = list(neighbors)
+        else:
+            self.neighbors = []
+            for (src, dst) in distances.keys():
+                if src == self.id:
+                    self.neighbors.append(dst)
+                elif dst == self.id:
+                    self.neighbors.append(src)
+
+        self.period = period
+
+        self.flows = {neighbor: (0, 0) for neighbor in self.neighbors}
+        self.estimates = {}
+
+        self.ticking = False
+
+        self.no_news = BoundedQueue(nonews)
+
+    def handle(self, src, data, instant):
+        """ Method invoked from simulator to handle events. Handle events depending on their type.
+
+        Arguments:
+            src {string} -- origin of the event
+            data {Message} -- payload of the event
+            instant {int} -- time the event occurred
+
+        Returns:
+            [array] -- events produced
+        """
+
+        # unpacking data
+        type, id, payload = data
+
+        if type is MessageType.GOSSIP:
+
+            return self.__gossip__(src, payload)
+
+        elif type is MessageType.TICK:
+
+            return self.__tick__()
+
+        else:
+
+            return []
+
+    def handle_batch(self, messages, instant):
+        """ Method invoked from simulator to handle the events delivered at the same instant. A round due at the
+        instant runs after the gossip, so it averages with the estimates just received instead of having the flows
+        it sends overwritten by them.
+
+        Arguments:
+            messages {array} -- (src, data) of each event
+            instant {int} -- time the events occurred
+
+        Returns:
+            [array] -- events produced
+        """
+
+        res = []
+
+        for (src, data) in sorted(messages, key=lambda message: message[1][0] is MessageType.TICK):
+            res += self.handle(src, data, instant)
+
+        return res
+
+    def __gossip__(self, src, payload):
+        """ Method invoked when received a gossip message. Adopts the flow and estimate of src.
+
+        Arguments:
+            src {string} -- origin of the event
+            payload {Message} -- Message payload
+
+        Returns:
+            [array] -- events produced
+        """
+
+        # case i'm an initial node
+        if src is None:
+
+            self.value = (self.value[0], self.value[1] + PushSumNode.__start_weight__(payload[3]))
+
+        else:
+
+            flow_sum, flow_weight, estimate_sum, estimate_weight = payload
+
+            # the flow from src to me is the symmetric of mine to src
+            self.flows[src] = (-flow_sum, -flow_weight)
+            self.estimates[src] = (estimate_sum, estimate_weight)
+
+        # a stopped node resumes when it gets news
+        return self.__resume__()
+
+    def add_neighbor(self, neighbor, instant):
+        """ Method invoked from simulator when a link to a new neighbor comes up.
+
+        Arguments:
+            neighbor {string} -- new neighbor
+            instant {int} -- time the link came up
+
+        Returns:
+            [array] -- events produced
+        """
+
+        if neighbor in self.flows:
+            return []
+
+        self.neighbors.append(neighbor)
+        self.flows[neighbor] = (0, 0)
+
+        return self.__resume__()
+
+    def remove_neighbor(self, neighbor, instant):
+        """ Method invoked from simulator when the link to a neighbor goes down or the neighbor leaves.
+        Dropping the flow of the link takes back whatever went through it.
+
+        Arguments:
+            neighbor {string} -- neighbor that is gone
+            instant {int} -- time the link went down
+
+        Returns:
+            [array] -- events produced
+        """
+
+        if neighbor not in self.flows:
+            return []
+
+        self.neighbors.remove(neighbor)
+        del self.flows[neighbor]
+        self.estimates.pop(neighbor, None)
+
+        return self.__resume__()
+
+    def __resume__(self):
+        """ Start rounds again on a node that has taken part in the aggregation and stopped.
+
+        Returns:
+            [array] -- events produced
+        """
+
+        if self.ticking or (len(self.estimates) == 0 and self.value[1] == 0):
+            return []
+
+        self.ticking = True
+
+        return self.__tick__()
+
+    def __tick__(self):
+        """ Runs a round: averages the estimates of the node and all its neighbors and sends the resulting flow
+        through every link.
+
+        Returns:
+            [array] -- events produced
+        """
+
+        self.sum = self.value[0] - sum(flow[0] for flow in self.flows.values())
+        self.weight = self.value[1] - sum(flow[1] for flow in self.flows.values())
+
+        # without weight there is no estimate yet, and no reason to stop
+        if self.weight > 0:
+            self.aggregate = round(self.sum / self.weight, 3)
+
+            # stopping rounds while there is no news, once every neighbor has been reached
+            if self.no_news.compare(self.aggregate) and len(self.estimates) == len(self.neighbors):
+                self.ticking = False
+                return []
+
+            self.no_news.add(self.aggregate)
+
+        # averaging with every neighbor estimate, the ones not heard from yet being assumed empty
+        known = [self.estimates.get(neighbor, (0, 0)) for neighbor in self.neighbors]
+        average_sum = (self.sum + sum(estimate[0] for estimate in known)) / (len(known) + 1)
+        average_weight = (self.weight + sum(estimate[1] for estimate in known)) / (len(known) + 1)
+
+        res = []
+
+        # every link moves the estimate of its neighbor to the average, which leaves the node with it too
+        for neighbor, (estimate_sum, estimate_weight) in zip(self.neighbors, known):
+
+            flow_sum, flow_weight = self.flows[neighbor]
+
+            self.flows[neighbor] = (flow_sum + average_sum - estimate_sum, flow_weight + average_weight - estimate_weight)
+            self.estimates[neighbor] = (average_sum, average_weight)
+
+            res.append((neighbor, (MessageType.GOSSIP, self.__id__(), self.flows[neighbor] + (average_sum, average_weight)), 0))
+
+        # scheduling next round
+        res.append((self.id, (MessageType.TICK, self.__id__(), []), self.period))
+
+        return res
+
+    def mass(self):
+        """ Sum and weight the node holds. Flows only move estimates, so they are not part of it, and a MassMonitor
+        does not see flows going wrong.
+
+        Returns:
+            [(float, float)] -- sum and weight
+        """
+
+        return self.value
+
+    def carried(self, data):
+        """ Sum and weight a message carries, only start messages carrying any.
+
+        Arguments:
+            data {Message} -- message
+
+        Returns:
+            [(float, float)] -- sum and weight of a start message, None for other messages
+        """
+
+        type, id, payload = data
+
+        if type is not MessageType.GOSSIP or not isinstance(payload[0], GossipType):
+            return None
+
+        return 0, PushSumNode.__start_weight__(payload[3])
+
+    def __id__(self):
+        """ Create an unique ID for an event.
+
+        Returns:
+            [(string, int)] -- Unique ID of a message, as the node and its sequence number
+        """
+
+        # Incrementing ID
+        self.message_id += 1
+
+        return self.id, self.message_id
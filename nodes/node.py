@@ -5,3 +5,27 @@ class Node:
     # returns e.g. [(dst0, msg0), (dst1, msg1), ...]
     def handle(self, src, data, instant):
         pass
+
+    # handles messages delivered at the same instant, e.g. [(src0, data0), (src1, data1), ...]
+    # returns e.g. [(dst0, msg0), (dst1, msg1), ...]
+    def handle_batch(self, messages, instant):
+        res = []
+        for (src, data) in messages:
+            res += self.handle(src, data, instant)
+        return res
+
+    # a link to neighbor came up, returns events like handle
+    def add_neighbor(self, neighbor, instant):
+        pass
+
+    # the link to neighbor went down or neighbor left, returns events like handle
+    def remove_neighbor(self, neighbor, instant):
+        pass
+
+    # returns the sum and weight the node holds, e.g. (sum, weight)
+    def mass(self):
+        pass
+
+    # returns the sum and weight a message carries, e.g. (sum, weight), None when it carries none
+    def carried(self, data):
+        pass
@@ -0,0 +1,13 @@
+from enum import Enum
+
+
+class ProtocolType(Enum):
+    """ Different aggregation protocols can be used.
+
+    Arguments:
+        Enum {Enumeration} -- type of the Protocol Type
+    """
+    PUSH_SUM = 1
+    PUSH_PULL = 2
+    FLOW_UPDATING = 3
+    SPANNING_TREE = 4
@@ -0,0 +1,98 @@
+from .pushsum import PushSumNode, MessageType, GossipType
+
+
+class PushPullNode(PushSumNode):
+    """ Class that implements push-pull averaging over sum and weight pairs. A node pushes a share of its pair to
+    each chosen neighbor, which averages it with its own pair and pulls back half of the total, so both ends of an
+    exchange leave it holding the same values. Delivery relies on the acknowledgments and retransmissions of the
+    PushSumNode.
+
+    Arguments:
+        PushSumNode {PushSumNode} -- node whose fault detection is reused
+    """
+
+    def __gossip__(self, src, id, payload):
+        """ Method invoked when received a gossip message.
+
+        Arguments:
+            src {string} -- origin of the event
+            id {int} -- id of the message
+            payload {Message} -- Message payload
+
+        Returns:
+            [array] -- events produced
+        """
+
+        # triplet received
+        type, round, sum, weight = payload
+
+        # case i'm an initial node
+        if src is None:
+
+            self.weight = self.weight + self.__start_weight__(weight)
+
+            return self.__increment_round__()
+
+        # for returning
+        res = [(src, (MessageType.ACK, id, []), 0)]
+
+        if type is GossipType.REQUEST and (round not in self.requested or src not in self.requested[round]):
+
+            # If its a round I haven't been tracking yet
+            if round not in self.requested:
+                self.requested[round] = []
+
+            # Adding request to received messages
+            self.requested[round].append(src)
+
+            # Averaging with the pushed share, half of the total goes back
+            self.sum = (self.sum + sum) / 2
+            self.weight = (self.weight + weight) / 2
+
+            event = self.__identify__(
+                (src, (MessageType.GOSSIP, -1, (GossipType.RESPONSE, round, self.sum, self.weight)), 0))
+
+            res += self.__safe_send__(event)
+
+        elif type is GossipType.RESPONSE and src not in self.responded[round]:
+
+            # Adding response to received messages
+            self.responded[round].append(src)
+
+            # Changing my values
+            self.sum = self.sum + sum
+            self.weight = self.weight + weight
+
+        else:
+
+            # Duplicate, only acknowledging
+            return res
+
+        return res + self.__increment_round__()
+
+    def __multi_request__(self):
+        """ Push an equal share of the aggregation pair to fanout direct neighbors, keeping one for the node
+
+        Returns:
+            [array] -- events produced
+        """
+
+        res = []
+
+        self.fanout = self.__next_fanout__()
+
+        self.sum = self.sum / (self.fanout + 1)
+        self.weight = self.weight / (self.fanout + 1)
+
+        self.targets = self.__pick_targets__()
+
+        for neighbor in self.targets:
+
+            # Gossip Request event
+            event = self.__identify__(
+                (neighbor, (MessageType.GOSSIP, -1, (GossipType.REQUEST, self.round, self.sum, self.weight)), 0))
+
+            # Sending
+            res += self.__safe_send__(event)
+
+        return res
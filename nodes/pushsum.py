@@ -13,7 +13,8 @@ class PushSumNode(Node):
         Node {Node} -- interface to implement
     """
 
-    def __init__(self, id, distances, initial_value, fanout, nonews):
+    def __init__(self, id, distances, initial_value, fanout, nonews, neighbors=None, adaptive=False, rng=None,
+                 tolerance=1e-5):
         """ Constructor for the PushSumNode
 
         Arguments:
@@ -23,6 +24,12 @@ class PushSumNode(Node):
             fanout {int} -- fanout value that represents the number of neighbors to send a message
             nonews {int} -- number of the no news array
 
+        Keyword Arguments:
+            neighbors {array} -- direct neighbors, found by scanning distances when not given (default: {None})
+            adaptive {bool} -- adjust the fanout at each round, up to the given one, from local signals (default: {False})
+            rng {Random} -- generator the peers are picked with, the random module when not given (default: {None})
+            tolerance {float} -- relative change of the aggregate an adaptive node takes as no news (default: {1e-5})
+
         Instantiated Attributes:
             id {int} -- node id
             message_id {int} -- # unique message ids
@@ -35,6 +42,15 @@ class PushSumNode(Node):
             requested {dictionary} -- dictionary of the neighbors who have requested each round
             neighbors {array} -- direct neighbors 
             fanout {int} -- fanout value
+            max_fanout {int} -- requested fanout value, capped by the number of neighbors at each round
+            targets {array} -- neighbors requested in the current round
+            adaptive {bool} -- whether the fanout is adjusted at each round
+            previous {float} -- aggregate when the last round started (None before the first round)
+            tolerance {float} -- relative change of the aggregate an adaptive node takes as no news
+            reference {float} -- aggregate an adaptive node last took as news (None before any)
+            contacted {set} -- neighbors an adaptive node has requested
+            loss {float} -- smoothed share of sent messages that had to be retransmitted
+            rng {Random} -- generator the peers are picked with
             rto {int} -- Initial Retransmission Timeout (in milliseconds)
             srtt {int} -- Smoothed Round-trip Time (-1 as it has no initial value)
             rttvar {int} -- Variation in Round-trip time (-1 as it has no initial value)
@@ -60,15 +76,29 @@ class PushSumNode(Node):
 
         self.requested = {}
 
-        self.neighbors = []
-        for (src, dst) in distances.keys():
-            if src == self.id:
-                self.neighbors.append(dst)
-            elif dst == self.id:
-                self.neighbors.append(src)
+        if neighbors is not None:
+            self.neighbors = list(neighbors)
+        else:
+            self.neighbors = []
+            for (src, dst) in distances.keys():
+                if src == self.id:
+                    self.neighbors.append(dst)
+                elif dst == self.id:
+                    self.neighbors.append(src)
 
         num_neighbors = len(self.neighbors)
+        self.max_fanout = fanout
         self.fanout = fanout if fanout <= num_neighbors else num_neighbors
+        self.targets = []
+
+        self.adaptive = adaptive
+        self.previous = None
+        self.tolerance = tolerance
+        self.reference = None
+        self.contacted = set()
+        self.loss = 0
+
+        self.rng = rng if rng is not None else random
 
         # Fault detection parameters (based on TCP)
         self.rto = {neighbor: 60 for neighbor in self.neighbors} 
@@ -134,10 +164,10 @@ class PushSumNode(Node):
         # for returning
         res = []
 
-        # case i'm the initial node
+        # case i'm an initial node
         if src is None:
 
-            self.weight = 1
+            self.weight = self.weight + self.__start_weight__(weight)
 
         else:
 
@@ -154,8 +184,8 @@ class PushSumNode(Node):
                 res += self.__respond__(src, round)
 
                 # Changing my values
-                self.sum += sum
-                self.weight += weight
+                self.sum = self.sum + sum
+                self.weight = self.weight + weight
 
                 # Appending ACK
                 res.append((src, (MessageType.ACK, id, []), 0))
@@ -173,8 +203,8 @@ class PushSumNode(Node):
                 self.responded[round].append(src)
 
                 # Changing my values
-                self.sum += sum
-                self.weight += weight
+                self.sum = self.sum + sum
+                self.weight = self.weight + weight
 
                 # Appending ACK 
                 res.append((src, (MessageType.ACK, id, []), 0))
@@ -204,14 +234,19 @@ class PushSumNode(Node):
 
         # If timer was reset, then a response was received for the message
         if id not in self.timers:
-            # print(" :: Not resending!", end="")
             return []
 
-        # print(" :: Resending!", end="")
+        # Not resending to a neighbor that is gone
+        if dst not in self.rto:
+            del self.timers[id]
+            return []
 
         # Doubling RTO
         self.rto[dst] = min(self.rto[dst] * 2, self.max_rto)
 
+        # Each backoff is a sign of loss
+        self.loss = 0.875 * self.loss + 0.125
+
         # Re-sending message
         return self.__safe_send__(event)
 
@@ -232,6 +267,9 @@ class PushSumNode(Node):
         # Resetting timer
         del self.timers[id]
 
+        # Each acknowledgment is a sign of delivery
+        self.loss = 0.875 * self.loss
+
         # Updating RTO parameters
         if self.srtt[src] == -1:  # First RTO calculation for node
 
@@ -250,6 +288,58 @@ class PushSumNode(Node):
 
         return []
 
+    def add_neighbor(self, neighbor, instant):
+        """ Method invoked from simulator when a link to a new neighbor comes up.
+
+        Arguments:
+            neighbor {string} -- new neighbor
+            instant {int} -- time the link came up
+
+        Returns:
+            [array] -- events produced
+        """
+
+        self.current_instant = instant
+
+        if neighbor not in self.rto:
+            self.neighbors.append(neighbor)
+
+            self.rto[neighbor] = 60
+            self.srtt[neighbor] = -1
+            self.rttvar[neighbor] = -1
+
+        return []
+
+    def remove_neighbor(self, neighbor, instant):
+        """ Method invoked from simulator when the link to a neighbor goes down or the neighbor leaves.
+
+        Arguments:
+            neighbor {string} -- neighbor that is gone
+            instant {int} -- time the link went down
+
+        Returns:
+            [array] -- events produced
+        """
+
+        self.current_instant = instant
+
+        if neighbor not in self.rto:
+            return []
+
+        self.neighbors.remove(neighbor)
+
+        del self.rto[neighbor]
+        del self.srtt[neighbor]
+        del self.rttvar[neighbor]
+
+        # a neighbor that is gone will not respond, so the round must not wait for it
+        if self.round in self.responded and neighbor in self.targets and neighbor not in self.responded[self.round]:
+            self.responded[self.round].append(neighbor)
+
+            return self.__increment_round__()
+
+        return []
+
     def __respond__(self, dst, round):
         """ Sends an aggregation pair to one specific node.
 
@@ -261,8 +351,9 @@ class PushSumNode(Node):
             [array] -- events produced
         """
 
-        self.sum /= 2
-        self.weight /= 2
+        # values are rebound instead of updated in place, as sent payloads may share them
+        self.sum = self.sum / 2
+        self.weight = self.weight / 2
 
         event = self.__identify__(
             (dst, (MessageType.GOSSIP, -1, (GossipType.RESPONSE, round, self.sum, self.weight)), 0))
@@ -278,11 +369,13 @@ class PushSumNode(Node):
 
         res = []
 
-        self.aggregate = round(self.sum / self.weight, 3)
+        self.aggregate = self.__estimate__()
+
+        news = self.__news__()
 
         # multicast only when there isn't previous round and the current round isn't in the map
         # or the previous round has finished
-        if (self.round not in self.responded or (len(self.responded[self.round]) == self.fanout)) and not self.no_news.compare(self.aggregate):
+        if (self.round not in self.responded or (len(self.responded[self.round]) == self.fanout)) and not self.no_news.compare(news):
 
             # increment current round
             self.round += 1
@@ -290,10 +383,94 @@ class PushSumNode(Node):
 
             res += self.__multi_request__()
 
-        self.no_news.add(self.aggregate)
+        self.no_news.add(news)
 
         return res
 
+    def __estimate__(self):
+        """ Current estimate of the aggregate.
+
+        Returns:
+            [float] -- sum over weight, rounded to 3 decimal places, or the previous one while there is no weight
+        """
+
+        if self.weight == 0:
+            return self.aggregate
+
+        return round(self.sum / self.weight, 3)
+
+    @staticmethod
+    def __start_weight__(weight):
+        """ Weight a start message gives its initiator.
+
+        Arguments:
+            weight {float or array} -- weight carried by the start message, None when it carries none
+
+        Returns:
+            [float or array] -- weight carried, or a unit weight when there is none
+        """
+
+        return 1 if weight is None else weight
+
+    def __news__(self):
+        """ Value kept in the no news queue. An adaptive node keeps the aggregate it last took as news, and only
+        takes a new one when the aggregate moved by more than tolerance from it, so that it stops once its aggregate
+        settles within tolerance instead of waiting for every decimal to settle.
+
+        Returns:
+            [float] -- value to compare and add to the no news queue
+        """
+
+        if not self.adaptive:
+            return self.aggregate
+
+        if self.reference is None or abs(self.aggregate - self.reference) > self.tolerance * abs(self.aggregate):
+            self.reference = self.aggregate
+
+        return self.reference
+
+    def __next_fanout__(self):
+        """ Fanout for the round about to start. Neighbors may have come and gone since the last round.
+        An adaptive node uses the highest fanout while its aggregate moves by more than 1% a round, spreading mass
+        fast while it is far from the result, and a fanout of 1 once it settles, where more messages per round buy
+        little. The highest fanout is scaled down by the observed loss, as lost messages cost retransmissions.
+
+        Returns:
+            [int] -- fanout value
+        """
+
+        fanout = min(self.max_fanout, len(self.neighbors))
+
+        if not self.adaptive or fanout <= 1:
+            return fanout
+
+        # nothing has settled before the first round
+        moving = self.previous is None or abs(self.aggregate - self.previous) > 0.01 * abs(self.aggregate)
+
+        self.previous = self.aggregate
+
+        if not moving:
+            return 1
+
+        return max(1, round(1 + (fanout - 1) * (1 - self.loss)))
+
+    def __pick_targets__(self):
+        """ Pick the neighbors requested in the round about to start, fanout of them at random. An adaptive node
+        stops once its aggregate settles within tolerance, so it picks the neighbors it has not requested yet first,
+        lest a neighbor nobody requests be left out of the aggregate.
+
+        Returns:
+            [array] -- neighbors to request
+        """
+
+        self.rng.shuffle(self.neighbors)
+
+        if self.adaptive:
+            self.neighbors.sort(key=lambda neighbor: neighbor in self.contacted)
+            self.contacted.update(self.neighbors[:self.fanout])
+
+        return self.neighbors[:self.fanout]
+
     def __multi_request__(self):
         """ Multicast an aggregation pair to a fanout direct neighbors
 
@@ -303,23 +480,21 @@ class PushSumNode(Node):
 
         res = []
 
-        self.sum /= self.fanout + 1
-        self.weight /= self.fanout + 1
+        self.fanout = self.__next_fanout__()
 
-        random.shuffle(self.neighbors)
+        self.sum = self.sum / (self.fanout + 1)
+        self.weight = self.weight / (self.fanout + 1)
 
-        fan = 1
-        for neighbor in self.neighbors:
+        self.targets = self.__pick_targets__()
 
-            if fan <= self.fanout:
-                # Gossip Request event
-                event = self.__identify__(
-                    (neighbor, (MessageType.GOSSIP, -1, (GossipType.REQUEST, self.round, self.sum, self.weight)), 0))
+        for neighbor in self.targets:
 
-                # Sending 
-                res += self.__safe_send__(event)
+            # Gossip Request event
+            event = self.__identify__(
+                (neighbor, (MessageType.GOSSIP, -1, (GossipType.REQUEST, self.round, self.sum, self.weight)), 0))
 
-            fan += 1
+            # Sending 
+            res += self.__safe_send__(event)
 
         return res
 
@@ -347,17 +522,47 @@ class PushSumNode(Node):
 
         return res
 
+    def mass(self):
+        """ Sum and weight the node holds.
+
+        Returns:
+            [(float, float)] -- sum and weight
+        """
+
+        return self.sum, self.weight
+
+    def carried(self, data):
+        """ Sum and weight a message carries.
+
+        Arguments:
+            data {Message} -- message
+
+        Returns:
+            [(float, float)] -- sum and weight of a gossip message, None for other messages
+        """
+
+        type, id, payload = data
+
+        if type is not MessageType.GOSSIP:
+            return None
+
+        # start messages are the only ones without an id
+        if id == -1:
+            return 0, self.__start_weight__(payload[3])
+
+        return payload[2], payload[3]
+
     def __id__(self):
         """ Create an unique ID for an event.
 
         Returns:
-            [string] -- Unique ID of a message
+            [(string, int)] -- Unique ID of a message, as the node and its sequence number
         """
 
         # Incrementing ID
         self.message_id += 1
 
-        return "[{},{}]".format(self.id, self.message_id)
+        return self.id, self.message_id
 
     def __identify__(self, event):
         """ Transforms event into unique event.
@@ -388,6 +593,7 @@ class MessageType(Enum):
     GOSSIP = 1
     RETRANSMISSION = 2
     ACK = 3
+    TICK = 4
 
 
 class GossipType(Enum):
@@ -0,0 +1,331 @@
+from enum import Enum
+
+from .boundedqueue import BoundedQueue
+from .pushsum import PushSumNode, MessageType
+
+
+class SpanningTreeNode(PushSumNode):
+    """ Class that aggregates over a spanning tree built from the initiator. The initiator explores the graph, and
+    since every link has the same latency the first exploration to reach a node comes through a shortest path,
+    making its sender the parent of the node (a BFS tree). Sums and weights are then collected up the tree and the
+    result is broadcast down it. Messages rely on the acknowledgments and retransmissions of the PushSumNode. A
+    node that loses a tree link falls back to push-sum gossip with the mass it holds and tells its neighbors to do
+    the same, so the whole graph gossips instead of waiting on a tree that will not complete.
+
+    Arguments:
+        PushSumNode {PushSumNode} -- node whose fault detection and gossip are reused
+    """
+
+    def __init__(self, id, distances, initial_value, fanout, nonews, neighbors=None, rng=None):
+        """ Constructor for the SpanningTreeNode
+
+        Arguments:
+            id {int} -- node id
+            distances {dictionary} -- dictionary of pairs and distances
+            initial_value {int} -- value that a node holds
+            fanout {int} -- fanout value used after falling back to gossip
+            nonews {int} -- number of the no news array used after falling back to gossip
+
+        Keyword Arguments:
+            neighbors {array} -- direct neighbors, found by scanning distances when not given (default: {None})
+            rng {Random} -- generator the peers are picked with after falling back to gossip (default: {None})
+
+        Instantiated Attributes:
+            gossiping {bool} -- whether the node fell back to gossip
+            joined {bool} -- whether the node is part of the tree
+            parent {string} -- parent in the tree, None for the initiator
+            children {array} -- children in the tree, in the order they answered
+            waiting {array} -- explored neighbors that have not answered yet, in neighbor order
+            collected {bool} -- whether the node sent the mass of its subtree up, or broadcast the result
+            done {bool} -- whether the node got the result of the tree
+            handled {set} -- (tree message type, src) pairs already handled
+        """
+
+        super().__init__(id, distances, initial_value, fanout, nonews, neighbors, rng=rng)
+
+        self.gossiping = False
+
+        self.joined = False
+        self.parent = None
+        self.children = []
+        self.waiting = []
+        self.collected = False
+        self.done = False
+
+        self.handled = set()
+
+    def __gossip__(self, src, id, payload):
+        """ Method invoked when received a gossip message. Tree messages are handled here, gossip ones by the
+        PushSumNode after falling back to gossip.
+
+        Arguments:
+            src {string} -- origin of the event
+            id {int} -- id of the message
+            payload {Message} -- Message payload
+
+        Returns:
+            [array] -- events produced
+        """
+
+        type, round, sum, weight = payload
+
+        # case i'm the initial node
+        if src is None:
+
+            self.weight = self.weight + self.__start_weight__(weight)
+            self.joined = True
+
+            return self.__explore__()
+
+        if not isinstance(type, TreeType):
+
+            return self.__fallback__() + super().__gossip__(src, id, payload)
+
+        # for returning
+        res = [(src, (MessageType.ACK, id, []), 0)]
+
+        # Duplicate, only acknowledging
+        if (type, src) in self.handled:
+            return res
+
+        self.handled.add((type, src))
+
+        if type is TreeType.UP:
+
+            # the mass of a subtree is kept whatever the mode
+            self.sum = self.sum + sum
+            self.weight = self.weight + weight
+
+            if self.gossiping:
+                return res + self.__increment_round__()
+
+        if type is TreeType.FALLBACK:
+
+            return res + self.__fallback__()
+
+        if self.gossiping:
+
+            # letting explorers complete their subtree
+            if type is TreeType.EXPLORE:
+                res += self.__send__(src, TreeType.REJECT, 0, 0)
+
+            # the tree completed before the node fell back, so its result holds all the mass
+            elif type is TreeType.DOWN and self.weight == 0:
+                res += self.__broadcast__(sum)
+
+            return res
+
+        if type is TreeType.EXPLORE and not self.joined:
+
+            self.joined = True
+            self.parent = src
+
+            return res + self.__explore__()
+
+        elif type is TreeType.EXPLORE:
+
+            return res + self.__send__(src, TreeType.REJECT, 0, 0)
+
+        elif type is TreeType.REJECT:
+
+            self.__answered__(src)
+
+        elif type is TreeType.UP:
+
+            self.children.append(src)
+            self.__answered__(src)
+
+        elif type is TreeType.DOWN:
+
+            return res + self.__broadcast__(sum)
+
+        return res + self.__collect__()
+
+    def __explore__(self):
+        """ Explore every neighbor but the parent.
+
+        Returns:
+            [array] -- events produced
+        """
+
+        res = []
+
+        self.waiting = [neighbor for neighbor in self.neighbors if neighbor != self.parent]
+
+        for neighbor in self.waiting:
+            res += self.__send__(neighbor, TreeType.EXPLORE, 0, 0)
+
+        return res + self.__collect__()
+
+    def __answered__(self, neighbor):
+        """ Stop waiting for an explored neighbor.
+
+        Arguments:
+            neighbor {string} -- neighbor that answered or is gone
+        """
+
+        if neighbor in self.waiting:
+            self.waiting.remove(neighbor)
+
+    def __collect__(self):
+        """ Once every explored neighbor answered, send the mass of the subtree to the parent, or broadcast the
+        result if this is the initiator.
+
+        Returns:
+            [array] -- events produced
+        """
+
+        if self.waiting or self.collected:
+            return []
+
+        self.collected = True
+
+        if self.parent is None:
+            return self.__broadcast__(self.__estimate__())
+
+        sum, weight = self.sum, self.weight
+        self.sum, self.weight = 0, 0
+
+        return self.__send__(self.parent, TreeType.UP, sum, weight)
+
+    def __broadcast__(self, aggregate):
+        """ Adopt the result of the tree and pass it to the children.
+
+        Arguments:
+            aggregate {float} -- result of the tree
+
+        Returns:
+            [array] -- events produced
+        """
+
+        res = []
+
+        self.aggregate = aggregate
+        self.done = True
+
+        for child in self.children:
+            res += self.__send__(child, TreeType.DOWN, aggregate, 0)
+
+        return res
+
+    def __send__(self, dst, type, sum, weight):
+        """ Reliably send a tree message.
+
+        Arguments:
+            dst {string} -- destiny of the message
+            type {TreeType} -- type of the message
+            sum {float} -- sum carried, or the result for DOWN messages
+            weight {float} -- weight carried
+
+        Returns:
+            [array] -- events produced
+        """
+
+        event = self.__identify__((dst, (MessageType.GOSSIP, -1, (type, 0, sum, weight)), 0))
+
+        return self.__safe_send__(event)
+
+    def __fallback__(self):
+        """ Switch to gossip with the mass the node holds, telling every neighbor to switch too: the tree above and
+        below the node would otherwise keep waiting for messages it no longer sends.
+
+        Returns:
+            [array] -- events produced
+        """
+
+        if self.gossiping:
+            return []
+
+        self.gossiping = True
+
+        res = []
+
+        for neighbor in list(self.neighbors):
+            res += self.__send__(neighbor, TreeType.FALLBACK, 0, 0)
+
+        return res + self.__increment_round__()
+
+    def __increment_round__(self):
+        """ Gossip rounds of a node that fell back. The estimate of a node without weight cannot change, so its
+        rounds are not counted as no news: it keeps gossiping, spreading its sum and pulling weight from the
+        neighbors that answer, until it gets an estimate of its own.
+
+        Returns:
+            [array] -- events produced
+        """
+
+        res = super().__increment_round__()
+
+        if self.weight == 0:
+            self.no_news = BoundedQueue(self.no_news.size)
+
+        return res
+
+    def __retransmission__(self, event):
+        """ Method invoked when received a retransmission message. A tree message whose timeout hits the maximum
+        means its link is failing, so the node falls back to gossip while retransmitting it.
+
+        Arguments:
+            event {Event} -- event to be retransmitted
+
+        Returns:
+            [array] -- events produced
+        """
+
+        dst, data, delay = event
+        type, id, payload = data
+
+        res = super().__retransmission__(event)
+
+        if res and isinstance(payload[0], TreeType) and self.rto[dst] == self.max_rto:
+            res += self.__fallback__()
+
+        return res
+
+    def remove_neighbor(self, neighbor, instant):
+        """ Method invoked from simulator when the link to a neighbor goes down or the neighbor leaves. Losing the
+        parent or a neighbor the node is waiting for breaks the tree, so the node falls back to gossip.
+
+        Arguments:
+            neighbor {string} -- neighbor that is gone
+            instant {int} -- time the link went down
+
+        Returns:
+            [array] -- events produced
+        """
+
+        res = super().remove_neighbor(neighbor, instant)
+
+        if not self.done and (neighbor == self.parent or neighbor in self.waiting):
+            self.__answered__(neighbor)
+            res += self.__fallback__()
+
+        return res
+
+    def carried(self, data):
+        """ Sum and weight a message carries, DOWN messages carrying the result instead.
+
+        Arguments:
+            data {Message} -- message
+
+        Returns:
+            [(float, float)] -- sum and weight, None for messages without any
+        """
+
+        if data[0] is MessageType.GOSSIP and data[2][0] is TreeType.DOWN:
+            return None
+
+        return super().carried(data)
+
+
+class TreeType(Enum):
+    """ Different types of tree messages recognized by the SpanningTreeNode, numbered after the GossipType ones.
+
+    Arguments:
+        Enum {Enumeration} -- type of the Tree Message
+    """
+    EXPLORE = 3
+    REJECT = 4
+    UP = 5
+    DOWN = 6
+    FALLBACK = 7
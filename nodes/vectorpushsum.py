@@ -0,0 +1,86 @@
+import numpy
+
+from .boundedqueue import BoundedArrayQueue
+from .pushsum import PushSumNode
+
+
+class VectorPushSumNode(PushSumNode):
+    """ PushSumNode that aggregates many quantities at once, carrying arrays of sums and weights in each GOSSIP
+    payload, so that K aggregates cost the messages of a single simulation.
+
+    Arguments:
+        PushSumNode {PushSumNode} -- node whose protocol is reused
+    """
+
+    def __init__(self, id, distances, initial_value, fanout, nonews, neighbors=None, convergence="component",
+                 tolerance=1e-3, rng=None):
+        """ Constructor for the VectorPushSumNode
+
+        Arguments:
+            id {int} -- node id
+            distances {dictionary} -- dictionary of pairs and distances
+            initial_value {array} -- values that a node holds, one per aggregate
+            fanout {int} -- fanout value that represents the number of neighbors to send a message
+            nonews {int} -- number of the no news array
+
+        Keyword Arguments:
+            neighbors {array} -- direct neighbors, found by scanning distances when not given (default: {None})
+            convergence {string} -- "component" to stop when every aggregate is settled, "worst" to stop when the
+                                    aggregate that changes the most is within tolerance (default: {"component"})
+            tolerance {float} -- relative change allowed in "worst" convergence (default: {1e-3})
+            rng {Random} -- generator the peers are picked with, the random module when not given (default: {None})
+
+        Instantiated Attributes:
+            sum {ndarray} -- sum calculated values
+            weight {ndarray} -- weight calculated values
+            aggregate {ndarray} -- aggregate calculated values
+            no_news {BoundedArrayQueue} -- Termination info
+        """
+
+        super().__init__(id, distances, initial_value, fanout, nonews, neighbors, rng=rng)
+
+        self.sum = numpy.array(initial_value, dtype=float, ndmin=1)
+        self.weight = numpy.zeros(len(self.sum))
+        self.aggregate = self.sum
+
+        self.no_news = BoundedArrayQueue(nonews, len(self.sum), convergence, tolerance)
+
+    @property
+    def converged(self):
+        """ Aggregates that have settled according to the no news rule.
+
+        Returns:
+            [ndarray] -- boolean mask with one entry per aggregate
+        """
+
+        return self.no_news.settled
+
+    def __gossip__(self, src, id, payload):
+        """ Method invoked when received a gossip message.
+
+        Arguments:
+            src {string} -- origin of the event
+            id {int} -- id of the message
+            payload {Message} -- Message payload
+
+        Returns:
+            [array] -- events produced
+        """
+
+        # case i'm an initial node, holding the weight it is given for every aggregate
+        if src is None:
+
+            self.weight = self.weight + self.__start_weight__(payload[3])
+
+            return self.__increment_round__()
+
+        return super().__gossip__(src, id, payload)
+
+    def __estimate__(self):
+        """ Current estimate of the aggregates.
+
+        Returns:
+            [ndarray] -- sums over weights, rounded to 3 decimal places
+        """
+
+        return numpy.round(self.sum / self.weight, 3)
@@ -1 +1 @@
-__all__ = ["sim", "faulty"]
+__all__ = ["sim", "faulty", "trace", "churntype", "streams", "runstatus", "footprint", "monitor", "reference"]
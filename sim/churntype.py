@@ -0,0 +1,12 @@
+from enum import Enum
+
+
+class ChurnType(Enum):
+    """ Different membership changes the simulator can apply while running.
+
+    Arguments:
+        Enum {Enumeration} -- type of the Churn Type
+    """
+    JOIN = 1
+    LEAVE = 2
+    LINK_FAIL = 3
@@ -1,6 +1,11 @@
+from .churntype import ChurnType
+from .footprint import footprint, sample_footprint
+from .runstatus import RunStatus
 from .sim import DiscreteEventSimulator
 
-import random
+import collections
+
+import numpy
 
 
 class FaultySimulator(DiscreteEventSimulator):
@@ -10,7 +15,8 @@ class FaultySimulator(DiscreteEventSimulator):
         DiscreteEventSimulator {DiscreteEventSimulator} -- Interface to implement
     """
 
-    def __init__(self, nodes, distances, fault_chance=0, simulation_time=1000):
+    def __init__(self, nodes, distances, fault_chance=0, simulation_time=1000, trace=None, rng=None,
+                 memory_budget=None, memory_interval=1000, monitor=None):
         """ Constructor for FaultySimulator class.
 
         Arguments:
@@ -20,20 +26,44 @@ class FaultySimulator(DiscreteEventSimulator):
         Keyword Arguments:
             fault_chance {int} -- probability of losing a message in simulation (default: {0})
             simulation_time {int} -- time to run simulation in milliseconds (logical time incremented by the simulator) (default: {1000})
+            trace {TraceWriter} -- writer that records every delivered and dropped event (default: {None})
+            rng {Generator} -- numpy generator the faults are drawn from, seeded from the OS entropy when not given (default: {None})
+            memory_budget {int} -- bytes the queue and the node state may take; when given, handled events are not kept (give a trace to spill them to disk) and the run is aborted once the budget is exceeded (default: {None})
+            memory_interval {int} -- number of instants between memory measurements (default: {1000})
+            monitor {MassMonitor} -- checks that the nodes conserve sum and weight (default: {None})
 
         Instantiated Attributes:
             nodes {Node} -- graph nodes
             current_instant -- simulator current instant tracker, based on the time of events
             distances {array of pairs} -- distances between each node 
+            links {dictionary} -- distance to each neighbor of each node, kept up to date with churn
+            topology {SharedTopology} -- topology the links of a node are read from when first needed, None when distances is a dictionary
             pending {array of events} -- contains all the events to handle (i.e. [(instant, (src, dst, data))])
             fault_chance {int} -- probability of losing a message in simulation (default: {0})
             simulation_time {int} -- time to run simulation in milliseconds (current_instant incremented by the simulator) (default: {1000})
+            trace {TraceWriter} -- writer that records every delivered and dropped event
+            rng {Generator} -- numpy generator the faults are drawn from
+            memory_budget {int} -- bytes the queue, the node state and the output may take
+            memory_interval {int} -- number of instants between memory measurements
+            memory {dictionary} -- peak bytes measured for the queue, the node state and the output
+            delivered {Counter} -- number of events delivered, by message type
+            status {RunStatus} -- why the simulation stopped, None while it runs
+            monitor {MassMonitor} -- checks that the nodes conserve sum and weight
         """
 
         self.nodes = nodes
 
         self.distances = distances
 
+        # a shared topology is read one node at a time, when its links are first needed
+        self.topology = distances if hasattr(distances, "links") else None
+
+        self.links = {}
+        if self.topology is None:
+            self.links = {node: {} for node in nodes}
+            for (src, dst) in distances:
+                self.links[src][dst] = self.links[dst][src] = distances[(src, dst)]
+
         self.current_instant = 0
 
         self.pending = []
@@ -42,25 +72,45 @@ class FaultySimulator(DiscreteEventSimulator):
 
         self.simulation_time = simulation_time
 
+        self.trace = trace
+
+        self.rng = rng if rng is not None else numpy.random.default_rng()
+
+        self.memory_budget = memory_budget
+        self.memory_interval = memory_interval
+        self.memory = {"queue": 0, "nodes": 0, "output": 0}
+
+        self.delivered = collections.Counter()
+
+        self.status = None
+
+        self.monitor = monitor
+
     def start(self, initial_data, initial_node):
         """ Starts the simulation, introducing the first event in the simulation, then starts the loop.
+        Several nodes start at once when given a list of nodes, with either the same content or a list of contents.
 
         Arguments:
-            initial_data {string} -- Content of the first event
-            initial_node {string} -- Destination of the first event in the simulation
+            initial_data {string or array} -- Content of the first event, or of the first event of each node
+            initial_node {string or array} -- Destination of the first event in the simulation, or destinations
 
         Returns:
             [array of events] -- events that the loop generated
         """
 
-        # starting randomizer
-        random.seed()
+        initial_nodes = list(initial_node) if isinstance(initial_node, (list, tuple)) else [initial_node]
+        initial_datas = initial_data if isinstance(initial_data, list) else [initial_data] * len(initial_nodes)
+
+        for dst, data in zip(initial_nodes, initial_datas):
 
-        # creating first event [instant, (src, dst, data)]
-        instant, src, dst, data = 0, None, initial_node, initial_data
+            # creating first event [instant, (src, dst, data)]
+            instant, src = 0, None
 
-        # schedule first event 
-        self.pending.append((instant, (src, dst, data)))
+            # schedule first event
+            self.pending.append((instant, (src, dst, data)))
+
+        if self.monitor is not None:
+            self.monitor.begin(self.nodes, self.pending)
 
         # run the loop
         return self.__loop__()
@@ -79,81 +129,308 @@ class FaultySimulator(DiscreteEventSimulator):
 
         return self.__loop__()
 
+    def join(self, instant, node, neighbors, distance=10):
+        """ Schedule a node to join the graph.
+
+        Arguments:
+            instant {int} -- time the node joins
+            node {Node} -- node joining, ignored if its id is in use by then
+            neighbors {array} -- nodes it links to, the ones not in the graph by then being skipped
+
+        Keyword Arguments:
+            distance {int} -- distance of its links (default: {10})
+        """
+
+        self.pending.append((instant, (None, None, (ChurnType.JOIN, node, (neighbors, distance)))))
+
+    def leave(self, instant, node):
+        """ Schedule a node to leave the graph. Events to and from it are discarded from then on.
+
+        Arguments:
+            instant {int} -- time the node leaves
+            node {string} -- id of the node leaving, ignored if not in the graph by then
+        """
+
+        self.pending.append((instant, (None, None, (ChurnType.LEAVE, node, None))))
+
+    def fail_link(self, instant, src, dst):
+        """ Schedule the link between two nodes to fail. Events through it are discarded from then on, and nothing
+        happens if the link is not up by then.
+
+        Arguments:
+            instant {int} -- time the link fails
+            src {string} -- one end of the link
+            dst {string} -- other end of the link
+        """
+
+        self.pending.append((instant, (None, None, (ChurnType.LINK_FAIL, src, dst))))
+
     def __loop__(self):
         """ Loop that delivers events to the nodes, calculates time, distances and discards events.
+        All the events due at the same instant are taken from the queue at once: their faults are drawn together and
+        they are handed to each destination node in a single call. Memory is measured every memory_interval instants, and
+        sum and weight are checked every monitor.interval instants.
 
         Returns:
-            [array of events] -- All the events that occurred in the simulation
+            [array of events] -- All the events that occurred in the simulation, empty when running on a memory budget
         """
 
         # creating a sorted event list
         ordered_events = []
 
+        # handled events are only counted, not kept, when memory is bounded
+        keep = self.memory_budget is None
+
+        self.status = None
+        instants = 0
+
         # running loop
         while len(self.pending) > 0 and self.current_instant <= self.simulation_time:  # 1000ms maximum
 
-            # getting the event with lowest instant
-            event = min(self.pending, key=lambda e: e[0])
+            instants += 1
+            if instants % self.memory_interval == 0 and not self.__measure__(ordered_events):
+                self.status = RunStatus.MEMORY_LIMIT
+                break
+
+            if self.monitor is not None and instants % self.monitor.interval == 0:
+                self.monitor.check(self.current_instant)
 
-            # unfolding event properties
-            instant, src, dst, data = event[0], event[1][0], event[1][1], event[1][2]
+            # getting the lowest instant
+            instant = min(e[0] for e in self.pending)
 
             # simulator time
             self.current_instant = instant
 
-            # removing event from the queue
-            self.pending.remove(event)
+            # removing the events due now from the queue, keeping their order
+            batch = [e for e in self.pending if e[0] == instant]
+            self.pending = [e for e in self.pending if e[0] != instant]
+
+            # membership changes take effect before the messages of the same instant
+            if any(e[1][1] is None for e in batch):
+                for event in batch:
+                    if event[1][1] is None:
+                        if keep:
+                            ordered_events.append(event)
+                        self.delivered[event[1][2][0]] += 1
+                        self.__churn__(*event[1][2])
+
+                # nodes leaving take their mass with them
+                if self.monitor is not None:
+                    self.monitor.rebase(self.nodes)
+
+                batch = [e for e in batch if e[1][1] is not None]
+
+            # drawing the faults of the whole batch
+            faults = self.rng.random(len(batch)) < self.fault_chance if self.fault_chance > 0 else None
+
+            # grouping the events by destination node
+            groups = {}
+
+            for i, event in enumerate(batch):
+
+                # unfolding event properties
+                src, dst = event[1][0], event[1][1]
 
-            # skipping event based on fault probability
-            if src != dst and random.random() < self.fault_chance and src is not None:
+                # skipping event based on fault probability
+                if faults is not None and faults[i] and src != dst and src is not None:
 
-                # print("\n[ ] {:.3f}".format(instant) + "s :: " + str(src) + " -> " + str(dst) + " :: " + str(data), end="")
+                    if self.trace is not None:
+                        self.trace.record(event, True)
 
-                # skipping iteration
-                continue
+                    # skipping event
+                    continue
 
-            # else:
-                # print(("\n" if src is not None else "" )+ "[X] {:.3f}".format(instant) + "s :: " + str(src) + " -> " + str(dst) + " :: " + str(data), end="")
+                # keeping event if event is valid
+                if dst in self.nodes and (src is None or src == dst or dst in self.__links__(src)):
+                    # appending event to sorted event list
+                    if keep:
+                        ordered_events.append(event)
+                    self.delivered[event[1][2][0]] += 1
 
-            # executing event if event is valid
-            if (src, dst) in self.distances or (dst, src) in self.distances or src == dst or src is None:
-                # appending event to sorted event list
-                ordered_events.append(event)
+                    groups.setdefault(dst, []).append(event)
 
-                # generating new events from event
-                self.__exec__(event)
+            for dst, events in groups.items():
+
+                # generating new events from events
+                self.__exec__(dst, events)
+
+                if self.trace is not None:
+                    self.trace.record_batch(events, self.nodes[dst])
+
+        if self.monitor is not None:
+            self.monitor.check(self.current_instant)
+
+        if self.status is None:
+            self.__measure__(ordered_events)
+            self.status = RunStatus.COMPLETED if len(self.pending) == 0 else RunStatus.TIME_LIMIT
 
         # returning sorted event list
         return ordered_events
 
-    def __exec__(self, event):
-        """ Node handles the event, and its results are translated into simulator events.
+    def __measure__(self, ordered_events):
+        """ Measure the memory taken by the queue, the node state and the output, keeping the peak of each.
+
+        Arguments:
+            ordered_events {array of events} -- events kept so far
+
+        Returns:
+            [bool] -- whether the measured memory fits the budget
+        """
+
+        # node names and shared values are counted once
+        seen = set()
+        nodes = sum(footprint(node, seen) for node in self.nodes.values())
+
+        # events hold the names of the nodes they go through
+        names = {id(name) for name in self.links}
+        names.update(id(name) for links in self.links.values() for name in links)
+
+        current = {"queue": sample_footprint(self.pending, shared=names), "nodes": nodes,
+                   "output": sample_footprint(ordered_events, shared=names)}
+
+        for subsystem, size in current.items():
+            self.memory[subsystem] = max(self.memory[subsystem], size)
+
+        return self.memory_budget is None or sum(current.values()) <= self.memory_budget
+
+    def __exec__(self, dst, events):
+        """ Node handles the events delivered to it at the current instant, and its results are translated into
+        simulator events.
 
         Arguments:
-            event {(instant, (src, dst, data))} -- Has information about the instant, its source, the destiny and the actual payload
+            dst {string} -- node the events are delivered to
+            events {array of (instant, (src, dst, data))} -- Have information about the instant, their source, the destiny and the actual payload
         """
 
-        # unfolding event properties
-        instant, src, dst, data = event[0], event[1][0], event[1][1], event[1][2]
+        node = self.nodes[dst]
+
+        if self.monitor is not None:
+            before = node.mass()
+            for event in events:
+                self.monitor.received(node, event[1][2])
 
-        # node handling event and generating new datas
-        new_datas = self.nodes[dst].handle(src, data, self.current_instant)
+        # node handling events and generating new datas
+        new_datas = node.handle_batch([(e[1][0], e[1][2]) for e in events], self.current_instant)
 
-        # update src node
-        new_src = dst
+        if self.monitor is not None:
+            self.monitor.handled(before, node.mass())
+
+        self.__schedule__(dst, new_datas)
+
+    def __schedule__(self, new_src, new_datas):
+        """ Translate the results of a node into simulator events.
+
+        Arguments:
+            new_src {string} -- node that produced the results
+            new_datas {array} -- results, i.e. [(dst, data, delay)]
+        """
+
+        links = self.__links__(new_src)
+
+        if self.monitor is not None:
+            for (new_dst, new_data, delay) in new_datas:
+                self.monitor.sent(self.nodes[new_src], new_data)
 
         # generating events for each data
         for (new_dst, new_data, delay) in new_datas:
             # get distance to node
-            distance = 0
-            if (new_src, new_dst) in self.distances:
-                distance = self.distances[(new_src, new_dst)]
-
-            elif (new_dst, new_src) in self.distances:
-                distance = self.distances[(new_dst, new_src)]
+            distance = links.get(new_dst, 0)
 
             # creating new event
-            new_event = (instant + distance + delay, (new_src, new_dst, new_data))
+            new_event = (self.current_instant + distance + delay, (new_src, new_dst, new_data))
 
             # appending event to pending
             self.pending.append(new_event)
+
+    def __links__(self, node):
+        """ Distance to each neighbor of a node, read from the shared topology the first time it is needed.
+
+        Arguments:
+            node {string} -- node name
+
+        Returns:
+            [dictionary] -- distance by neighbor, empty for a node not in the graph
+        """
+
+        links = self.links.get(node)
+
+        if links is None:
+            if self.topology is None or node not in self.nodes:
+                return {}
+
+            links = self.links[node] = self.topology.links(node)
+
+        return links
+
+    def __churn__(self, type, node, args):
+        """ Apply a membership change, updating only the nodes and links it touches. Changes that no longer apply
+        when they are due, e.g. a node leaving that is not in the graph, are ignored.
+
+        Arguments:
+            type {ChurnType} -- type of the change
+            node {Node or string} -- node joining, node leaving, or one end of the failing link
+            args {any} -- (neighbors, distance) when joining, the other end when a link fails
+        """
+
+        if type is ChurnType.JOIN:
+
+            # a node already in the graph is not replaced
+            if node.id in self.nodes:
+                return
+
+            neighbors, distance = args
+
+            self.nodes[node.id] = node
+            self.links[node.id] = {}
+
+            # only linking to the neighbors in the graph when it joins
+            for neighbor in neighbors:
+                if neighbor in self.nodes and neighbor != node.id:
+                    self.__link__(node.id, neighbor, distance)
+
+        elif type is ChurnType.LEAVE:
+
+            if node not in self.nodes:
+                return
+
+            for neighbor in list(self.__links__(node)):
+                self.__unlink__(node, neighbor)
+
+            # kept empty, so that its links are not read from the topology again
+            del self.nodes[node]
+            self.links[node] = {}
+
+        elif type is ChurnType.LINK_FAIL:
+
+            self.__unlink__(node, args)
+
+    def __link__(self, src, dst, distance):
+        """ Bring a link up and tell both ends about it.
+
+        Arguments:
+            src {string} -- one end of the link
+            dst {string} -- other end of the link
+            distance {int} -- distance of the link
+        """
+
+        self.__links__(src)[dst] = self.__links__(dst)[src] = distance
+
+        self.__schedule__(src, self.nodes[src].add_neighbor(dst, self.current_instant) or [])
+        self.__schedule__(dst, self.nodes[dst].add_neighbor(src, self.current_instant) or [])
+
+    def __unlink__(self, src, dst):
+        """ Bring a link down and tell both ends about it.
+
+        Arguments:
+            src {string} -- one end of the link
+            dst {string} -- other end of the link
+        """
+
+        if dst not in self.__links__(src):
+            return
+
+        del self.__links__(src)[dst]
+        del self.__links__(dst)[src]
+
+        self.__schedule__(src, self.nodes[src].remove_neighbor(dst, self.current_instant) or [])
+        self.__schedule__(dst, self.nodes[dst].remove_neighbor(src, self.current_instant) or [])
@@ -0,0 +1,72 @@
+import sys
+import types
+from enum import Enum
+
+import numpy
+
+
+def footprint(obj, seen=None):
+    """ Approximate number of bytes an object takes, following the containers and instance attributes it holds.
+    Objects already in seen are not counted again, so a seen set shared between calls counts shared objects once.
+
+    Arguments:
+        obj {any} -- object to measure
+
+    Keyword Arguments:
+        seen {set} -- ids of the objects already counted (default: {None})
+
+    Returns:
+        [int] -- number of bytes
+    """
+
+    seen = seen if seen is not None else set()
+
+    size = 0
+    stack = [obj]
+
+    while stack:
+        obj = stack.pop()
+
+        if id(obj) in seen or isinstance(obj, (type, types.ModuleType, types.FunctionType, types.MethodType, Enum)):
+            continue
+
+        seen.add(id(obj))
+
+        if isinstance(obj, numpy.ndarray):
+            size += sys.getsizeof(obj) if obj.base is None else obj.nbytes
+            continue
+
+        size += sys.getsizeof(obj)
+
+        if isinstance(obj, dict):
+            stack.extend(obj.keys())
+            stack.extend(obj.values())
+        elif isinstance(obj, (list, tuple, set, frozenset)):
+            stack.extend(obj)
+        elif hasattr(obj, "__dict__"):
+            stack.append(vars(obj))
+
+    return size
+
+
+def sample_footprint(items, samples=32, shared=()):
+    """ Approximate number of bytes a list and its items take, measuring a few items spread over it.
+
+    Arguments:
+        items {array} -- list to measure
+
+    Keyword Arguments:
+        samples {int} -- number of items measured (default: {32})
+        shared {set} -- ids of objects the items share with others, not counted (default: {()})
+
+    Returns:
+        [int] -- number of bytes
+    """
+
+    if not items:
+        return sys.getsizeof(items)
+
+    step = max(len(items) // samples, 1)
+    measured = items[::step]
+
+    return sys.getsizeof(items) + sum(footprint(item, set(shared)) for item in measured) * len(items) // len(measured)
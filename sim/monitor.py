@@ -0,0 +1,151 @@
+import numpy
+
+
+class MassMonitor:
+    """ Checks that the sum and weight held by the nodes plus the ones carried by messages in flight stay constant,
+    as push-sum style protocols require.
+
+    Totals are kept up to date by the simulator as it hands events to the nodes, at a constant cost per event, and
+    compared with the initial ones every interval instants. A message counts as in flight from the first time it is
+    sent to the first time it is delivered: retransmissions and duplicates of a message carry no new mass. Messages
+    are told apart by their id, and the ones without an id (e.g. the start messages) are each unique. The ids of
+    delivered messages are kept until the simulation ends, so the monitor grows with the number of messages.
+
+    Nodes must implement mass() and carried(data). Flow-updating nodes never move their values, only flows, and the
+    flows of a link only agree once its last message arrives, so for them the monitor only checks the start weights.
+    """
+
+    def __init__(self, interval=1000, tolerance=1e-6):
+        """ Constructor for a MassMonitor.
+
+        Keyword Arguments:
+            interval {int} -- number of instants between checks (default: {1000})
+            tolerance {float} -- relative difference allowed between the totals and the initial ones (default: {1e-6})
+
+        Instantiated Attributes:
+            interval {int} -- number of instants between checks
+            tolerance {float} -- relative difference allowed
+            held {(float, float)} -- sum and weight held by the nodes
+            flying {(float, float)} -- sum and weight carried by messages in flight
+            expected {(float, float)} -- sum and weight held and in flight when the simulation started
+            in_flight {dictionary} -- sum and weight of each identified message in flight, by id
+            arrived {set} -- ids of the messages delivered at least once
+            checks {int} -- number of checks made
+        """
+
+        self.interval = interval
+        self.tolerance = tolerance
+
+        self.held = (0, 0)
+        self.flying = (0, 0)
+        self.expected = (0, 0)
+
+        self.in_flight = {}
+        self.arrived = set()
+
+        self.checks = 0
+
+    def begin(self, nodes, pending):
+        """ Take the totals the simulation starts with.
+
+        Arguments:
+            nodes {dictionary} -- nodes of the simulation
+            pending {array of events} -- events scheduled before it starts
+        """
+
+        self.flying = (0, 0)
+        self.in_flight = {}
+        self.arrived = set()
+
+        for instant, (src, dst, data) in pending:
+            node = nodes.get(src, nodes.get(dst))
+            if node is not None:
+                self.sent(node, data)
+
+        self.rebase(nodes)
+
+    def rebase(self, nodes):
+        """ Take the totals again after a legitimate change of mass, e.g. a node leaving with what it holds.
+
+        Arguments:
+            nodes {dictionary} -- nodes of the simulation
+        """
+
+        masses = [node.mass() for node in nodes.values()]
+
+        self.held = (sum(mass[0] for mass in masses), sum(mass[1] for mass in masses))
+        self.expected = (self.held[0] + self.flying[0], self.held[1] + self.flying[1])
+
+    def sent(self, node, data):
+        """ Account for a message sent.
+
+        Arguments:
+            node {Node} -- node of the protocol that sent it
+            data {Message} -- message sent
+        """
+
+        carried = node.carried(data)
+        if carried is None:
+            return
+
+        id = data[1]
+
+        if isinstance(id, tuple):
+            if id in self.in_flight or id in self.arrived:
+                return
+
+            self.in_flight[id] = carried
+
+        self.flying = (self.flying[0] + carried[0], self.flying[1] + carried[1])
+
+    def received(self, node, data):
+        """ Account for a message delivered.
+
+        Arguments:
+            node {Node} -- node it was delivered to
+            data {Message} -- message delivered
+        """
+
+        carried = node.carried(data)
+        if carried is None:
+            return
+
+        id = data[1]
+
+        if isinstance(id, tuple):
+            if id not in self.in_flight:
+                return
+
+            carried = self.in_flight.pop(id)
+            self.arrived.add(id)
+
+        self.flying = (self.flying[0] - carried[0], self.flying[1] - carried[1])
+
+    def handled(self, before, after):
+        """ Account for the change of mass of a node that handled events.
+
+        Arguments:
+            before {(float, float)} -- sum and weight it held before
+            after {(float, float)} -- sum and weight it holds now
+        """
+
+        self.held = (self.held[0] + after[0] - before[0], self.held[1] + after[1] - before[1])
+
+    def check(self, instant):
+        """ Compare the totals with the initial ones.
+
+        Arguments:
+            instant {int} -- current instant, for the error message
+
+        Raises:
+            AssertionError: when sum or weight was created or lost
+        """
+
+        self.checks += 1
+
+        for name, held, flying, expected in zip(("sum", "weight"), self.held, self.flying, self.expected):
+            error = numpy.abs(held + flying - expected)
+
+            if numpy.any(error > self.tolerance * numpy.maximum(numpy.abs(expected), 1)):
+                raise AssertionError("{} not conserved at instant {}: {} held and {} in flight, {} expected".format(
+                    name, instant, held, flying, expected))
@@ -0,0 +1,96 @@
+import heapq
+import itertools
+
+from .faulty import FaultySimulator
+from .runstatus import RunStatus
+
+
+class ReferenceSimulator(FaultySimulator):
+    """ FaultySimulator that hands events to the nodes one at a time, in the order they were scheduled, drawing a
+    fault for each of them. It keeps none of the optimizations of the FaultySimulator loop (batches, memory budget)
+    and serves as the reference faster simulators are checked against.
+
+    Arguments:
+        FaultySimulator {FaultySimulator} -- simulator whose nodes, links and churn are reused
+    """
+
+    def __loop__(self):
+        """ Loop that delivers events to the nodes one by one, the earliest first and, among events due at the same
+        instant, the first scheduled. Sum and weight are checked every monitor.interval instants, like the
+        FaultySimulator does.
+
+        Returns:
+            [array of events] -- All the events that occurred in the simulation
+        """
+
+        # creating a sorted event list
+        ordered_events = []
+
+        self.status = None
+        instants = 0
+
+        queue = []
+        sequence = itertools.count()
+
+        # running loop
+        while True:
+
+            # moving the newly scheduled events to the queue
+            for event in self.pending:
+                heapq.heappush(queue, (event[0], next(sequence), event))
+            self.pending = []
+
+            if len(queue) == 0 or self.current_instant > self.simulation_time:
+                break
+
+            instant, _, event = heapq.heappop(queue)
+            src, dst, data = event[1]
+
+            # checking every monitor.interval instants, before handling the first event of an instant
+            if instants == 0 or instant != self.current_instant:
+                instants += 1
+                if self.monitor is not None and instants % self.monitor.interval == 0:
+                    self.monitor.check(self.current_instant)
+
+            # simulator time
+            self.current_instant = instant
+
+            # membership change
+            if dst is None:
+                ordered_events.append(event)
+                self.delivered[data[0]] += 1
+                self.__churn__(*data)
+
+                if self.monitor is not None:
+                    self.monitor.rebase(self.nodes)
+
+                continue
+
+            # skipping event based on fault probability
+            if self.fault_chance > 0 and self.rng.random() < self.fault_chance and src != dst and src is not None:
+
+                if self.trace is not None:
+                    self.trace.record(event, True)
+
+                continue
+
+            # keeping event if event is valid
+            if dst in self.nodes and (src is None or src == dst or dst in self.__links__(src)):
+                ordered_events.append(event)
+                self.delivered[data[0]] += 1
+
+                self.__exec__(dst, [event])
+
+                if self.trace is not None:
+                    self.trace.record(event, False, self.nodes[dst])
+
+        # events left for proceed
+        self.pending = [event for _, _, event in sorted(queue)]
+
+        if self.monitor is not None:
+            self.monitor.check(self.current_instant)
+
+        self.status = RunStatus.COMPLETED if len(self.pending) == 0 else RunStatus.TIME_LIMIT
+
+        # returning sorted event list
+        return ordered_events
@@ -0,0 +1,12 @@
+from enum import Enum
+
+
+class RunStatus(Enum):
+    """ Different ways a simulation can stop.
+
+    Arguments:
+        Enum {Enumeration} -- type of the Run Status
+    """
+    COMPLETED = 1
+    TIME_LIMIT = 2
+    MEMORY_LIMIT = 3
@@ -0,0 +1,106 @@
+import random
+from enum import Enum
+
+import numpy
+
+
+class RandomStreams:
+    """ Independent random number streams of a run, one per purpose, all derived from a single seed.
+
+    Each stream is keyed by the seed, the run and its purpose, so drawing more numbers for one purpose never
+    shifts the others, and runs executing in parallel share no state. Two configurations given the same seed and
+    run key use the same topology, faults, values and peer choices as far as their executions agree (common random
+    numbers).
+    """
+
+    def __init__(self, seed=None, run=()):
+        """ Constructor for RandomStreams.
+
+        Keyword Arguments:
+            seed {int} -- root seed, drawn from the OS entropy when not given (default: {None})
+            run {tuple} -- integers identifying the run, e.g. (vertices, repetition) (default: {()})
+
+        Instantiated Attributes:
+            seed {int} -- root seed, to reproduce the run
+            run {tuple} -- integers identifying the run
+        """
+
+        self.seed = numpy.random.SeedSequence(seed).entropy
+        self.run = tuple(int(i) for i in run)
+
+    def topology(self):
+        """ Generator for building the graph.
+
+        Returns:
+            [Generator] -- numpy generator
+        """
+
+        return numpy.random.default_rng(self.__sequence__(StreamType.TOPOLOGY))
+
+    def faults(self):
+        """ Generator for drawing message losses.
+
+        Returns:
+            [Generator] -- numpy generator
+        """
+
+        return numpy.random.default_rng(self.__sequence__(StreamType.FAULTS))
+
+    def initiators(self):
+        """ Generator for picking the nodes that start the protocol.
+
+        Returns:
+            [Generator] -- numpy generator
+        """
+
+        return numpy.random.default_rng(self.__sequence__(StreamType.INITIATORS))
+
+    def values(self):
+        """ Generator for drawing the initial values of the nodes.
+
+        Returns:
+            [Generator] -- numpy generator
+        """
+
+        return numpy.random.default_rng(self.__sequence__(StreamType.VALUES))
+
+    def peers(self, node):
+        """ Generator for the peer selection of a node. Every node has its own, so a node picks the same peers
+        whatever the others do.
+
+        Arguments:
+            node {string} -- node name, e.g. "(3)"
+
+        Returns:
+            [Random] -- generator with the interface of the random module
+        """
+
+        state = self.__sequence__(StreamType.PEERS, int(node[1:-1])).generate_state(4, numpy.uint64)
+
+        return random.Random(int.from_bytes(state.tobytes(), "little"))
+
+    def __sequence__(self, purpose, *key):
+        """ Seed sequence of a stream.
+
+        Arguments:
+            purpose {StreamType} -- what the stream is used for
+            key {int} -- further integers identifying the stream
+
+        Returns:
+            [SeedSequence] -- seed sequence
+        """
+
+        return numpy.random.SeedSequence(self.seed, spawn_key=self.run + (purpose.value,) + key)
+
+
+class StreamType(Enum):
+    """ Purposes random numbers are drawn for.
+
+    Arguments:
+        Enum {Enumeration} -- purpose of a stream
+    """
+    TOPOLOGY = 1
+    FAULTS = 2
+    PEERS = 3
+    INITIATORS = 4
+    VALUES = 5
@@ -0,0 +1,212 @@
+import math
+import os
+
+import numpy
+
+
+# fixed-width layout of a traced event; sum and weight are the state of the destination node at the end of the
+# instant, after it handled every event delivered to it then, and NaN for dropped events
+RECORD = numpy.dtype([
+    ("instant", numpy.float64),
+    ("src", numpy.int32),
+    ("dst", numpy.int32),
+    ("type", numpy.uint8),
+    ("gossip", numpy.uint8),
+    ("dropped", numpy.bool_),
+    ("round", numpy.int32),
+    ("origin", numpy.int32),
+    ("sequence", numpy.int64),
+    ("sum", numpy.float64),
+    ("weight", numpy.float64),
+])
+
+
+class TraceWriter:
+    """
+    Appends the events handled by a simulator to a file of fixed-width records. Rows are buffered and copied in
+    bulk into a preallocated chunk, which is written out whenever it fills up.
+    """
+
+    def __init__(self, path, capacity=1 << 16):
+        """ Constructor for a TraceWriter.
+
+        Arguments:
+            path {string} -- file to write, replaced if it exists
+
+        Keyword Arguments:
+            capacity {int} -- number of records buffered before they are written (default: {1 << 16})
+
+        Instantiated Attributes:
+            path {string} -- file being written
+            count {int} -- number of records written
+            __file {file} -- open trace file
+            __chunk {ndarray} -- preallocated records written at once
+            __rows {array} -- rows buffered for the chunk
+            __vertices {dictionary} -- index of each node name seen
+        """
+
+        self.path = path
+        self.count = 0
+
+        self.__file = open(path, "wb")
+        self.__chunk = numpy.empty(capacity, dtype=RECORD)
+        self.__rows = []
+        self.__vertices = {None: -1, -1: -1}
+
+    def record(self, event, dropped, node=None):
+        """ Append an event to the trace.
+
+        Arguments:
+            event {(instant, (src, dst, data))} -- event handled by the simulator
+            dropped {bool} -- whether the event was lost
+
+        Keyword Arguments:
+            node {Node} -- destination node after handling the event, to save its sum and weight (default: {None})
+        """
+
+        self.record_batch([event], node, dropped)
+
+    def record_batch(self, events, node=None, dropped=False):
+        """ Append the events a node handled at the same instant. The sum and weight saved with each of them are the
+        state of the node at the end of the instant, after it handled all of them.
+
+        Arguments:
+            events {array} -- events handled by the simulator, as (instant, (src, dst, data))
+
+        Keyword Arguments:
+            node {Node} -- destination node after handling the events, to save its sum and weight (default: {None})
+            dropped {bool} -- whether the events were lost (default: {False})
+        """
+
+        sum, weight = math.nan, math.nan
+        if node is not None:
+            sum, weight = scalar(node.sum), scalar(node.weight)
+
+        vertices = self.__vertices
+        rows = self.__rows
+
+        for instant, (src, dst, data) in events:
+            type, id, payload = data
+
+            gossip, round = 0, -1
+            if type.value == 1 and isinstance(payload, tuple) and hasattr(payload[0], "value"):
+                gossip, round = payload[0].value, payload[1]
+
+            # ids are (node, sequence), start messages having none
+            origin, sequence = id if isinstance(id, tuple) else (None, -1)
+
+            for name in (src, dst, origin):
+                if name not in vertices:
+                    vertices[name] = vertex(name)
+
+            rows.append((instant, vertices[src], vertices[dst], type.value, gossip, dropped, round,
+                         vertices[origin], sequence, sum, weight))
+
+        if len(rows) >= len(self.__chunk):
+            self.__write__()
+
+    def close(self):
+        """ Write the buffered records and close the file.
+        """
+
+        self.__write__()
+        self.__file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __write__(self):
+        """ Copy the buffered rows into the chunk and append it to the file.
+        """
+
+        rows = self.__rows
+        size = len(self.__chunk)
+
+        # a batch can take the buffer past the chunk size
+        for start in range(0, len(rows), size):
+            part = rows[start:start + size]
+            chunk = self.__chunk[:len(part)]
+            chunk[:] = part
+            chunk.tofile(self.__file)
+
+        self.count += len(rows)
+        rows.clear()
+
+
+def read_trace(path):
+    """ Load a trace without copying it into memory.
+
+    Arguments:
+        path {string} -- file written by a TraceWriter
+
+    Returns:
+        [memmap] -- records, with one array per field (e.g. records["instant"]), an empty array when there are none
+    """
+
+    # empty files cannot be mapped
+    if os.path.getsize(path) == 0:
+        return numpy.empty(0, dtype=RECORD)
+
+    return numpy.memmap(path, dtype=RECORD, mode="r")
+
+
+def replay(records, until=None):
+    """ Reconstruct the sum and weight of every node from a trace.
+
+    Arguments:
+        records {ndarray} -- records of a trace
+
+    Keyword Arguments:
+        until {float} -- instant to reconstruct, the end of the trace if not given (default: {None})
+
+    Returns:
+        [dictionary] -- (sum, weight) of each node that handled an event, as of the end of its last instant
+    """
+
+    delivered = records[~records["dropped"]]
+
+    if until is not None:
+        delivered = delivered[delivered["instant"] <= until]
+
+    # last event handled by each node
+    dst = delivered["dst"][::-1]
+    nodes, last = numpy.unique(dst, return_index=True)
+    last = len(dst) - 1 - last
+
+    return {"(" + str(i) + ")": (float(delivered["sum"][j]), float(delivered["weight"][j]))
+            for i, j in zip(nodes.tolist(), last.tolist())}
+
+
+def vertex(node):
+    """ Index of a node, -1 if there is none.
+
+    Arguments:
+        node {string} -- node name, e.g. "(3)"
+
+    Returns:
+        [int] -- node index
+    """
+
+    if node is None or node == -1:
+        return -1
+
+    return int(node[1:-1]) if isinstance(node, str) and node.startswith("(") else int(node)
+
+
+def scalar(value):
+    """ Value as a float, NaN when it is not a number (e.g. vector aggregates).
+
+    Arguments:
+        value {any} -- value to convert
+
+    Returns:
+        [float] -- converted value
+    """
+
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return math.nan